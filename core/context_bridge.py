@@ -6,9 +6,13 @@ and diagnostics exchanged between application layers during a mission run.
 
 from __future__ import annotations
 
-from datetime import datetime
+import time
+from collections import ChainMap
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
 
 from .workspace_store import WorkspaceStore, get_workspace_store
 
@@ -16,6 +20,22 @@ if TYPE_CHECKING:  # pragma: no cover - import for type hints only
     from domain.entities import Mission
 
 
+# Dispatch par type exact: plus rapide que la chaîne isinstance
+# quand un type domine (listes dans la quasi-totalité des missions)
+_ITER_DISPATCH = {
+    list: lambda v: v,
+    tuple: list,
+    set: list,
+    type(None): lambda v: [],
+}
+
+
+@lru_cache(maxsize=64)
+def _resolve(path: str) -> str:
+    """Résolution de chemin mémoïsée (évite les readlink répétés)."""
+    return str(Path(path).resolve())
+
+
 class ContextBridge:
     """Central coordination hub for mission context."""
 
@@ -27,10 +47,18 @@ class ContextBridge:
         self._workspace_store = workspace_store or get_workspace_store()
         self._current_workspace: Optional[str] = self._workspace_store.get_last_workspace()
         self._outputs: List[Dict[str, Any]] = []
+        self._outputs_index: Dict[str, int] = {}
         self._diagnostics: List[Dict[str, Any]] = []
         self._mission_meta: Dict[str, Any] = {}
         self._mission_context: Dict[str, Any] = {}
         self._mission_name: Optional[str] = None
+        self._merged_meta: Optional[ChainMap] = None
+        self._ts_cache: tuple = (0, "")
+        self._outputs_dirty = True
+        self._diag_dirty = True
+        self._snapshot_cache: Optional[Dict[str, Any]] = None
+        self._snapshot_version = 0
+        self._diagnostics_enabled = True
 
     # ------------------------------------------------------------------
     # Workspace management
@@ -41,8 +69,12 @@ class ContextBridge:
         if not path:
             return
 
-        normalized = str(Path(path).resolve())
+        if path == self._current_workspace and auto_run is None:
+            return
+
+        normalized = _resolve(path)
         self._current_workspace = normalized
+        self._snapshot_cache = None
         self._workspace_store.set_workspace(normalized, auto_run=auto_run)
 
     def get_workspace(self) -> Optional[str]:
@@ -58,12 +90,7 @@ class ContextBridge:
     def get_mode(self) -> Optional[str]:
         """Return the mission execution mode if provided."""
 
-        mode = None
-        if isinstance(self._mission_context, dict):
-            mode = self._mission_context.get("mode")
-        if not mode and isinstance(self._mission_meta, dict):
-            mode = self._mission_meta.get("mode")
-        return mode
+        return self._merged_meta.get("mode") if self._merged_meta else None
 
     # ------------------------------------------------------------------
     # Mission attachment and output synchronisation
@@ -74,12 +101,17 @@ class ContextBridge:
         self._mission_name = mission.name
         self._mission_meta = mission.metadata.get("meta", {}) or {}
         self._mission_context = mission.metadata.get("context", {}) or {}
+        # Vue fusionnée contexte > meta: get_mode devient un lookup unique
+        self._merged_meta = ChainMap(
+            self._mission_context if type(self._mission_context) is dict else {},
+            self._mission_meta if type(self._mission_meta) is dict else {},
+        )
 
         workspace_hint = (
-            self._mission_context.get("workspace")
-            or self._mission_context.get("workspace_path")
+            self._merged_meta.get("workspace")
+            or self._merged_meta.get("workspace_path")
         )
-        auto_run = self._mission_context.get("auto_run")
+        auto_run = self._merged_meta.get("auto_run")
         if workspace_hint:
             self.set_workspace(str(workspace_hint), auto_run=auto_run)
 
@@ -93,56 +125,93 @@ class ContextBridge:
         """Normalise declared outputs for later tracking."""
 
         self._outputs = []
+        self._outputs_index = {}
 
         for entry in self._ensure_iterable(outputs_config):
             normalised = self._normalise_output_entry(entry)
             if normalised:
                 self._outputs.append(normalised)
+                destination = normalised.get("destination")
+                if destination is not None:
+                    self._outputs_index[destination] = len(self._outputs) - 1
 
+        self._outputs_dirty = True
         return self._outputs
 
     def register_output(self, destination: str, **metadata: Any) -> Dict[str, Any]:
         """Mark an output as materialised and capture related metadata."""
 
         normalized_destination = str(destination)
-        record = None
-        for item in self._outputs:
-            if item.get("destination") == normalized_destination:
-                record = item
-                break
+        idx = self._outputs_index.get(normalized_destination)
 
         status = metadata.pop("status", "created")
-        if record is None:
+        if idx is None:
             record = {"destination": normalized_destination, "status": status}
             self._outputs.append(record)
+            self._outputs_index[normalized_destination] = len(self._outputs) - 1
         else:
+            record = self._outputs[idx]
             record["status"] = status
 
         record.update(metadata)
         record.setdefault("updated_at", self._utc_timestamp())
+        self._outputs_dirty = True
         return record
 
-    def get_outputs(self) -> List[Dict[str, Any]]:
-        """Return a copy of the tracked outputs."""
+    def get_outputs(self) -> Tuple[Mapping[str, Any], ...]:
+        """Return read-only views of the tracked outputs.
+
+        Mutation goes through :meth:`register_output`; callers needing
+        mutable copies should use :meth:`copy_outputs`.
+        """
+
+        return tuple(MappingProxyType(item) for item in self._outputs)
+
+    def copy_outputs(self) -> List[Dict[str, Any]]:
+        """Return mutable copies of the tracked outputs."""
 
         return [dict(item) for item in self._outputs]
 
     # ------------------------------------------------------------------
     # Diagnostics handling
     # ------------------------------------------------------------------
+    def set_diagnostics_enabled(self, enabled: bool) -> None:
+        """Toggle diagnostic recording.
+
+        When disabled, :meth:`publish_diagnostic` becomes a cheap no-op:
+        useful for missions made of many small tasks where event
+        recording would dominate the executor loop.
+        """
+
+        self._diagnostics_enabled = bool(enabled)
+
+    @property
+    def diagnostics_enabled(self) -> bool:
+        """Whether diagnostic entries are currently recorded."""
+
+        return self._diagnostics_enabled
+
     def publish_diagnostic(self, source: str, payload: Any) -> Dict[str, Any]:
         """Record a diagnostic entry tagged with its source."""
 
+        if not self._diagnostics_enabled:
+            return {}
         entry = {
             "source": source,
             "timestamp": self._utc_timestamp(),
             "payload": payload,
         }
         self._diagnostics.append(entry)
+        self._diag_dirty = True
         return entry
 
-    def get_diagnostics(self) -> List[Dict[str, Any]]:
-        """Return collected diagnostics."""
+    def get_diagnostics(self) -> Tuple[Mapping[str, Any], ...]:
+        """Return read-only views of the collected diagnostics."""
+
+        return tuple(MappingProxyType(item) for item in self._diagnostics)
+
+    def copy_diagnostics(self) -> List[Dict[str, Any]]:
+        """Return mutable copies of the collected diagnostics."""
 
         return [dict(item) for item in self._diagnostics]
 
@@ -150,27 +219,59 @@ class ContextBridge:
     # Export helpers
     # ------------------------------------------------------------------
     def export_snapshot(self) -> Dict[str, Any]:
-        """Return a consolidated view of the bridge state."""
+        """Return a consolidated view of the bridge state.
+
+        Les sous-arbres inchangés depuis le dernier appel sont réutilisés
+        tels quels (rafraîchissement sans réallocation pour les boucles UI).
+        """
+
+        if (
+            self._snapshot_cache is not None
+            and not self._outputs_dirty
+            and not self._diag_dirty
+        ):
+            return self._snapshot_cache
+
+        cache = self._snapshot_cache
+        outputs = (
+            self.get_outputs()
+            if self._outputs_dirty or cache is None
+            else cache["outputs"]
+        )
+        diagnostics = (
+            self.get_diagnostics()
+            if self._diag_dirty or cache is None
+            else cache["diagnostics"]
+        )
 
-        return {
+        self._snapshot_version += 1
+        self._snapshot_cache = {
             "mission": {
                 "name": self._mission_name,
                 "meta": self._mission_meta,
                 "context": self._mission_context,
             },
             "workspace": self._current_workspace,
-            "outputs": self.get_outputs(),
-            "diagnostics": self.get_diagnostics(),
+            "outputs": outputs,
+            "diagnostics": diagnostics,
         }
+        self._outputs_dirty = False
+        self._diag_dirty = False
+        return self._snapshot_cache
 
     def reset(self) -> None:
         """Forget mission-specific data while preserving workspace knowledge."""
 
         self._outputs = []
+        self._outputs_index = {}
         self._diagnostics = []
         self._mission_meta = {}
         self._mission_context = {}
         self._mission_name = None
+        self._merged_meta = None
+        self._outputs_dirty = True
+        self._diag_dirty = True
+        self._snapshot_cache = None
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -180,10 +281,15 @@ class ContextBridge:
             return {}
 
         if isinstance(entry, dict):
+            # Réutilise l'entrée telle quelle quand elle est déjà normalisée:
+            # évite une allocation de dict par sortie déclarée
+            destination = entry.get("destination")
+            if "status" in entry and (destination is None or type(destination) is str):
+                return entry
             result = dict(entry)
             result.setdefault("status", "declared")
-            if "destination" in result:
-                result["destination"] = str(result["destination"])
+            if destination is not None:
+                result["destination"] = str(destination)
             return result
 
         if isinstance(entry, str):
@@ -192,16 +298,21 @@ class ContextBridge:
         return {"destination": str(entry), "status": "declared"}
 
     def _ensure_iterable(self, value: Any) -> List[Any]:
-        if value is None:
-            return []
-        if isinstance(value, list):
-            return value
-        if isinstance(value, tuple) or isinstance(value, set):
-            return list(value)
-        return [value]
+        fn = _ITER_DISPATCH.get(type(value))
+        return fn(value) if fn else [value]
 
     def _utc_timestamp(self) -> str:
-        return datetime.utcnow().isoformat() + "Z"
+        # Reformater une chaîne ISO par événement coûte cher lors des
+        # rafales de diagnostics: on met en cache la seconde courante
+        now_s = int(time.time())
+        if now_s == self._ts_cache[0]:
+            return self._ts_cache[1]
+        stamp = (
+            datetime.fromtimestamp(now_s, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            + "Z"
+        )
+        self._ts_cache = (now_s, stamp)
+        return stamp
 
 
 # Shared instance for convenience
@@ -2,8 +2,10 @@
 Core File Manager
 Gestion sécurisée des fichiers avec guardrail
 """
+import fnmatch
+import os
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from .guardrail import guardrail, GuardrailError
 
 
@@ -31,13 +33,12 @@ class FileManager:
             FileManagerError: Si le fichier ne peut pas être lu
         """
         try:
-            path = Path(file_path)
-            if not path.exists():
-                raise FileManagerError(f"File not found: {file_path}")
-            
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
-                
+            # Lecture directe sans stat() préalable ni boucle Python:
+            # read_text lit le fichier d'un bloc
+            return Path(file_path).read_text(encoding='utf-8')
+
+        except FileNotFoundError as e:
+            raise FileManagerError(f"File not found: {file_path}") from e
         except PermissionError as e:
             raise FileManagerError(f"Permission denied for file: {file_path}") from e
         except Exception as e:
@@ -65,13 +66,69 @@ class FileManager:
             path.parent.mkdir(parents=True, exist_ok=True)
             mode = 'a' if append else 'w'
 
-            with open(path, mode, encoding='utf-8') as f:
+            # Buffer de 1 MiB: réduit les appels write() pour les gros contenus
+            with open(path, mode, encoding='utf-8', buffering=1 << 20) as f:
                 f.write(content)
-                
+
         except PermissionError as e:
             raise FileManagerError(f"Permission denied for file: {file_path}") from e
         except Exception as e:
             raise FileManagerError(f"Error writing file {file_path}: {str(e)}") from e
+
+    def open_for_write(self, file_path: str, *, buffering: int = 1 << 17):
+        """
+        Ouvre un fichier en écriture (UTF-8) après vérification guardrail.
+
+        Permet une émission incrémentale (ex: json.dump) sans construire
+        le contenu complet en mémoire.
+
+        Args:
+            file_path: Le chemin du fichier à écrire
+            buffering: Taille du tampon d'écriture
+
+        Returns:
+            Un handle texte ouvert en écriture
+
+        Raises:
+            FileManagerError: Si le fichier ne peut pas être ouvert
+            GuardrailError: Si le chemin est protégé
+        """
+        guardrail.check_path(file_path, operation="write")
+        try:
+            path = Path(file_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return open(path, 'w', encoding='utf-8', buffering=buffering)
+        except PermissionError as e:
+            raise FileManagerError(f"Permission denied for file: {file_path}") from e
+        except Exception as e:
+            raise FileManagerError(f"Error opening file {file_path}: {str(e)}") from e
+
+    def write_files(self, batch: List[tuple]) -> None:
+        """
+        Écrit plusieurs fichiers en regroupant les créations de répertoires.
+
+        Args:
+            batch: Liste de tuples (file_path, content)
+
+        Raises:
+            FileManagerError: Si un fichier ne peut pas être écrit
+            GuardrailError: Si un chemin est protégé
+        """
+        # Un seul mkdir par répertoire parent (amorti sur le lot)
+        created_dirs = set()
+        for file_path, content in batch:
+            guardrail.check_path(file_path, operation="write")
+            parent = os.path.dirname(file_path)
+            if parent and parent not in created_dirs:
+                os.makedirs(parent, exist_ok=True)
+                created_dirs.add(parent)
+            try:
+                with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    f.write(content)
+            except PermissionError as e:
+                raise FileManagerError(f"Permission denied for file: {file_path}") from e
+            except Exception as e:
+                raise FileManagerError(f"Error writing file {file_path}: {str(e)}") from e
     
     def file_exists(self, file_path: str) -> bool:
         """
@@ -83,7 +140,7 @@ class FileManager:
         Returns:
             True si le fichier existe, False sinon
         """
-        return Path(file_path).exists()
+        return os.path.isfile(file_path)
     
     def list_files(self, directory: str, pattern: str = "*", recursive: bool = False) -> List[str]:
         """
@@ -98,24 +155,31 @@ class FileManager:
             Liste des chemins de fichiers trouvés
         """
         try:
-            path = Path(directory)
-            if not path.exists():
+            if not os.path.isdir(directory):
                 return []
-            
-            if recursive:
-                files = list(path.rglob(pattern))
-            else:
-                files = list(path.glob(pattern))
-            
-            # Filtrage des chemins protégés
-            file_paths = [str(f) for f in files if f.is_file()]
-            allowed_paths = guardrail.filter_allowed_paths(file_paths)
-            
+
+            # scandir réutilise les métadonnées du readdir: pas de stat()
+            # supplémentaire par entrée, et pas d'objet Path alloué
+            allowed_paths = [
+                p for p in self._scan_files(directory, pattern, recursive)
+                if not guardrail.is_sanctuary_path(p)
+            ]
+
             return sorted(allowed_paths)
-            
+
         except Exception as e:
             raise FileManagerError(f"Error listing files in {directory}: {str(e)}") from e
 
+    def _scan_files(self, directory: str, pattern: str, recursive: bool) -> Iterator[str]:
+        """Itère les chemins de fichiers correspondant au pattern via os.scandir."""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    if fnmatch.fnmatch(entry.name, pattern):
+                        yield entry.path
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    yield from self._scan_files(entry.path, pattern, recursive)
+
 
 # Instance globale du gestionnaire de fichiers
 file_manager = FileManager()
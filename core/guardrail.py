@@ -3,8 +3,9 @@ Core Guardrail
 Protection des chemins sanctuaires
 """
 import fnmatch
+import re
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from .settings import settings
 
 
@@ -20,55 +21,59 @@ class Guardrail:
     
     def __init__(self, sanctuary_paths: List[str] = None):
         self.sanctuary_paths = sanctuary_paths or settings.sanctuary_paths
-    
+        # Patterns précompilés une seule fois en un regex combiné; chaque
+        # pattern est son propre groupe pour remonter au pattern d'origine
+        # via lastindex en un seul scan
+        self._compiled: Optional[re.Pattern] = None
+        if self.sanctuary_paths:
+            self._compiled = re.compile(
+                "|".join(
+                    f"({fnmatch.translate(p.replace(chr(92), '/'))})"
+                    for p in self.sanctuary_paths
+                )
+            )
+
+    def _match(self, file_path: str) -> Optional[str]:
+        """Retourne le pattern sanctuaire correspondant au chemin, ou None."""
+        if self._compiled is None:
+            return None
+
+        file_path_str = str(file_path).replace('\\', '/')
+        match = self._compiled.match(file_path_str)
+        if match is None:
+            return None
+        return self.sanctuary_paths[match.lastindex - 1]
+
     def is_sanctuary_path(self, file_path: str) -> bool:
         """
         Vérifie si un chemin est protégé (sanctuaire).
-        
+
         Args:
             file_path: Le chemin à vérifier
-            
+
         Returns:
             True si le chemin est protégé, False sinon
         """
-        file_path_str = str(file_path).replace('\\', '/')
-        
-        for pattern in self.sanctuary_paths:
-            # Conversion du pattern pour fnmatch
-            normalized_pattern = pattern.replace('\\', '/')
-            if fnmatch.fnmatch(file_path_str, normalized_pattern):
-                return True
-        
-        return False
-    
+        return self._match(file_path) is not None
+
     def check_path(self, file_path: str, operation: str = "modify") -> None:
         """
         Vérifie qu'un chemin n'est pas protégé avant une opération.
-        
+
         Args:
             file_path: Le chemin à vérifier
             operation: L'opération prévue (read, write, modify, delete)
-            
+
         Raises:
             GuardrailError: Si le chemin est protégé
         """
-        if self.is_sanctuary_path(file_path):
+        matched = self._match(file_path)
+        if matched is not None:
             raise GuardrailError(
                 f"Operation '{operation}' on sanctuary path '{file_path}' is forbidden. "
-                f"Protected pattern: {self._find_matching_pattern(file_path)}"
+                f"Protected pattern: {matched}"
             )
     
-    def _find_matching_pattern(self, file_path: str) -> str:
-        """Trouve le pattern qui correspond au chemin"""
-        file_path_str = str(file_path).replace('\\', '/')
-        
-        for pattern in self.sanctuary_paths:
-            normalized_pattern = pattern.replace('\\', '/')
-            if fnmatch.fnmatch(file_path_str, normalized_pattern):
-                return pattern
-        
-        return "unknown"
-    
     def filter_allowed_paths(self, paths: List[str]) -> List[str]:
         """
         Filtre une liste de chemins pour ne garder que ceux autorisés.
@@ -86,18 +91,36 @@ class Guardrail:
 guardrail = Guardrail()
 
 
+# Mots-clés interdits en mode read_only, compilés en un seul passage regex
+_FORBIDDEN_RE = re.compile(r"write|delete|move", re.IGNORECASE)
+_FORBIDDEN = frozenset({"write", "delete", "move"})
+_WORD_RE = re.compile(r"[a-zA-Z]+")
+# Au-delà de cette taille, la tokenisation + intersection d'ensembles
+# est préférée au scan regex sur le texte entier
+_LARGE_TEXT_THRESHOLD = 4096
+
+# Cache du mode courant: (mtime du fichier config, mode)
+_MODE_CACHE: tuple[float, str] | None = None
+
+
 def _get_current_mode_from_config() -> str:
     """Lit le mode courant depuis config/settings.yaml si disponible."""
+    global _MODE_CACHE
     try:
         import yaml  # local import pour éviter dépendances globales ici
         from pathlib import Path as _Path
         cfg_path = _Path("config") / "settings.yaml"
         if not cfg_path.exists():
             return "write_enabled"
+        mtime = cfg_path.stat().st_mtime
+        if _MODE_CACHE is not None and _MODE_CACHE[0] == mtime:
+            return _MODE_CACHE[1]
         with open(cfg_path, "r", encoding="utf-8") as f:
             data = yaml.safe_load(f) or {}
         defaults = data.get("defaults", {})
-        return defaults.get("mode", "write_enabled")
+        mode = defaults.get("mode", "write_enabled")
+        _MODE_CACHE = (mtime, mode)
+        return mode
     except Exception:
         return "write_enabled"
 
@@ -109,7 +132,13 @@ def enforce_task_restrictions(task_text: str, mode: str | None = None) -> None:
     """
     active_mode = mode or _get_current_mode_from_config()
     if str(active_mode).lower() == "read_only":
-        lowered = (task_text or "").lower()
-        for keyword in ("write", "delete", "move"):
-            if keyword in lowered:
-                raise GuardrailError("Forbidden in read_only mode")
\ No newline at end of file
+        text = task_text or ""
+        if len(text) > _LARGE_TEXT_THRESHOLD:
+            # Textes volumineux: tokenisation en un passage puis test
+            # d'appartenance O(1) par token; le scan regex ne reste que
+            # pour attraper les mots-clés enfouis dans un token composé
+            tokens = {w.lower() for w in _WORD_RE.findall(text)}
+            if _FORBIDDEN & tokens or _FORBIDDEN_RE.search(text):
+                raise GuardrailError("Forbidden in read_only mode")
+        elif _FORBIDDEN_RE.search(text):
+            raise GuardrailError("Forbidden in read_only mode")
\ No newline at end of file
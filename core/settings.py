@@ -8,6 +8,28 @@ from typing import Dict, List, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # LibYAML absent, on retombe sur le loader pur Python
+    from yaml import SafeLoader as _YamlLoader
+
+
+# Cache des configurations parsées, clé (chemin absolu, mtime_ns)
+_YAML_CACHE: Dict[tuple, Optional[dict]] = {}
+
+
+def _load_yaml_config(config_path: str) -> Optional[dict]:
+    """Parse le fichier YAML avec mémoïsation basée sur le mtime."""
+    abs_path = os.path.abspath(config_path)
+    key = (abs_path, os.stat(abs_path).st_mtime_ns)
+    if key in _YAML_CACHE:
+        return _YAML_CACHE[key]
+
+    with open(abs_path, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+    _YAML_CACHE[key] = config
+    return config
+
 
 class Settings:
     """Paramètres globaux de l'application"""
@@ -39,6 +61,16 @@ class Settings:
         
         # Rollback
         self.enable_rollback: bool = True
+
+        # Paramètres HNSW de l'index vectoriel (Chroma)
+        self.index_params: Dict[str, object] = {
+            "hnsw:space": "cosine",
+            "hnsw:construction_ef": 200,
+            "hnsw:M": 32,
+            "hnsw:search_ef": 64,
+            "hnsw:batch_size": 1000,
+            "hnsw:sync_threshold": 10000,
+        }
         
         # Python minimum requis
         self.min_python: str = "3.10"
@@ -57,18 +89,20 @@ class Settings:
             return
         
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                if config:
-                    if 'ia' in config:
-                        self.ia_engine = config['ia'].get('engine', self.ia_engine)
-                        self.ia_model_default = config['ia'].get('model_default', self.ia_model_default)
-                        self.ia_model_alt = config['ia'].get('alt_model', self.ia_model_alt)
-                    
-                    if 'security' in config:
-                        self.enable_rollback = config['security'].get('rollback', self.enable_rollback)
-                        if 'sanctuary_paths' in config['security']:
-                            self.sanctuary_paths = config['security']['sanctuary_paths']
+            config = _load_yaml_config(self.config_path)
+            if config:
+                if 'ia' in config:
+                    self.ia_engine = config['ia'].get('engine', self.ia_engine)
+                    self.ia_model_default = config['ia'].get('model_default', self.ia_model_default)
+                    self.ia_model_alt = config['ia'].get('alt_model', self.ia_model_alt)
+
+                if 'index' in config:
+                    self.index_params.update(config['index'])
+
+                if 'security' in config:
+                    self.enable_rollback = config['security'].get('rollback', self.enable_rollback)
+                    if 'sanctuary_paths' in config['security']:
+                        self.sanctuary_paths = config['security']['sanctuary_paths']
         except Exception as e:
             # Si erreur, on garde les valeurs par défaut
             pass
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
+import atexit
+import os
+import time
 from datetime import datetime
-import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:  # orjson absent: repli sur le json standard
+    import json
+
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    _loads = json.loads
+
 
 STATE_DIR = Path("config") / "state"
 STATE_FILE = STATE_DIR / "workspace.json"
@@ -16,6 +33,9 @@ class WorkspaceStore:
     et conserve un petit historique.
     """
 
+    # Intervalle minimal entre deux écritures disque (secondes)
+    FLUSH_INTERVAL = 1.0
+
     def __init__(self, state_file: Path = STATE_FILE) -> None:
         self.state_file = state_file
         self.data: dict[str, Any] = {
@@ -23,12 +43,16 @@ class WorkspaceStore:
             "history": [],
             "auto_run": False,
         }
+        self._dirty = False
+        self._last_flush = 0.0
+        self._history_index: dict[str, int] = {}
         self._load()
+        atexit.register(self.flush)
 
     def _load(self) -> None:
         if self.state_file.exists():
             try:
-                self.data = json.loads(self.state_file.read_text(encoding="utf-8"))
+                self.data = _loads(self.state_file.read_bytes())
             except Exception:
                 # On ne casse pas le démarrage si le fichier est corrompu
                 self.data = {
@@ -36,11 +60,31 @@ class WorkspaceStore:
                     "history": [],
                     "auto_run": False,
                 }
+        self._rebuild_history_index()
+
+    def _rebuild_history_index(self) -> None:
+        self._history_index = {
+            h.get("path"): i
+            for i, h in enumerate(self.data.get("history", []))
+        }
 
     def save(self) -> None:
+        """Marque l'état comme modifié et écrit si l'intervalle est écoulé."""
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Écrit l'état sur disque (écriture atomique via fichier temporaire)."""
+        if not self._dirty:
+            return
         if not self.state_file.parent.exists():
             self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        self.state_file.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+        tmp_file = self.state_file.with_suffix(".json.tmp")
+        tmp_file.write_bytes(_dumps(self.data))
+        os.replace(tmp_file, self.state_file)
+        self._dirty = False
+        self._last_flush = time.monotonic()
 
     def get_last_workspace(self) -> str | None:
         return self.data.get("last_workspace")
@@ -48,11 +92,15 @@ class WorkspaceStore:
     def set_workspace(self, path: str, *, auto_run: bool | None = None) -> None:
         self.data["last_workspace"] = path
         now = datetime.utcnow().isoformat() + "Z"
-        # mettre à jour l'historique (sans doublons)
-        history = [h for h in self.data.get("history", []) if h.get("path") != path]
+        # mettre à jour l'historique (sans doublons, dédup O(1) via l'index)
+        history = self.data.get("history", [])
+        existing = self._history_index.get(path)
+        if existing is not None:
+            history.pop(existing)
         history.insert(0, {"path": path, "last_used": now})
         # on limite l'historique à 10 entrées
         self.data["history"] = history[:10]
+        self._rebuild_history_index()
         if auto_run is not None:
             self.data["auto_run"] = auto_run
         self.save()
@@ -64,6 +112,19 @@ class WorkspaceStore:
         return bool(self.data.get("auto_run", False))
 
 
+# Instance partagée: évite de relire le JSON à chaque appel
+_STORE: WorkspaceStore | None = None
+
+
 def get_workspace_store() -> WorkspaceStore:
-    return WorkspaceStore()
+    global _STORE
+    if _STORE is None:
+        _STORE = WorkspaceStore()
+    return _STORE
+
+
+def invalidate() -> None:
+    """Oublie l'instance partagée (le prochain appel relit le disque)."""
+    global _STORE
+    _STORE = None
 
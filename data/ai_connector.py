@@ -3,11 +3,23 @@ Data Layer: AI Connector
 Interface avec Ollama pour les modèles IA locaux
 """
 import json
-import subprocess
-from typing import List, Dict, Any, Optional
+import time
+from typing import Iterator, List, Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from core.settings import settings
 
 
+OLLAMA_BASE_URL = "http://localhost:11434"
+
+# Cache partagé des réponses /api/tags, clé par base_url, TTL en secondes
+# (évite un aller-retour HTTP par construction d'AIConnector)
+_OLLAMA_CACHE: Dict[str, tuple] = {}
+_OLLAMA_CACHE_TTL = 30.0
+
+
 class AIConnectorError(Exception):
     """Exception pour les erreurs de connexion IA"""
     pass
@@ -17,29 +29,43 @@ class AIConnector:
     """
     Connecteur vers Ollama pour l'exécution de modèles IA locaux.
     Supporte Qwen et DeepSeek.
+
+    Utilise l'API REST d'Ollama via une session HTTP persistante
+    (keep-alive), ce qui évite un fork/exec par requête et garde le
+    modèle résident côté serveur.
     """
-    
-    def __init__(self, model: Optional[str] = None):
+
+    def __init__(self, model: Optional[str] = None, base_url: str = OLLAMA_BASE_URL):
         self.model = model or settings.ia_model_default
         self.engine = settings.ia_engine
+        self.base_url = base_url.rstrip("/")
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("http://", adapter)
         self.ollama_available = self._check_ollama_availability()
-    
+
+    def _fetch_tags(self) -> Optional[dict]:
+        """Interroge /api/tags avec mise en cache TTL partagée."""
+        cached = _OLLAMA_CACHE.get(self.base_url)
+        if cached is not None and time.monotonic() - cached[0] < _OLLAMA_CACHE_TTL:
+            return cached[1]
+
+        try:
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=5)
+            payload = response.json() if response.status_code == 200 else None
+        except requests.RequestException:
+            payload = None
+
+        _OLLAMA_CACHE[self.base_url] = (time.monotonic(), payload)
+        return payload
+
     def _check_ollama_availability(self) -> bool:
         """Vérifie si Ollama est disponible"""
         if self.engine != "ollama":
             return False
-        
-        try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                check=False,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
-    
+
+        return self._fetch_tags() is not None
+
     def generate_response(
         self,
         prompt: str,
@@ -49,16 +75,41 @@ class AIConnector:
     ) -> str:
         """
         Génère une réponse à partir d'un prompt.
-        
+
         Args:
             prompt: Le prompt utilisateur
             system_prompt: Le prompt système (instructions de rôle)
             temperature: La température pour la génération
             max_tokens: Nombre maximum de tokens à générer
-            
+
         Returns:
             La réponse générée
-            
+
+        Raises:
+            AIConnectorError: Si la génération échoue
+        """
+        return "".join(
+            self.generate_response_stream(
+                prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        ).strip()
+
+    def generate_response_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Iterator[str]:
+        """
+        Génère une réponse en streaming, token par token.
+
+        Yields:
+            Les fragments de texte au fur et à mesure de la génération
+
         Raises:
             AIConnectorError: Si la génération échoue
         """
@@ -66,7 +117,7 @@ class AIConnector:
             raise AIConnectorError(
                 "Ollama is not available. Please install and start Ollama."
             )
-        
+
         # Construction du message pour Ollama
         messages = []
         if system_prompt:
@@ -78,95 +129,77 @@ class AIConnector:
             "role": "user",
             "content": prompt
         })
-        
+
         try:
-            # Appel à Ollama via l'API
-            result = subprocess.run(
-                [
-                    "ollama", "run",
-                    self.model,
-                    json.dumps(messages)
-                ],
-                capture_output=True,
-                text=True,
-                check=False
+            response = self._session.post(
+                f"{self.base_url}/api/chat",
+                json={
+                    "model": self.model,
+                    "messages": messages,
+                    "options": {
+                        "temperature": temperature,
+                        "num_predict": max_tokens,
+                    },
+                    "stream": True,
+                },
+                stream=True,
             )
-            
-            if result.returncode != 0:
-                # Fallback: essayer sans JSON
-                result = subprocess.run(
-                    [
-                        "ollama", "run",
-                        self.model,
-                        prompt
-                    ],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-            
-            if result.returncode != 0:
+
+            if response.status_code != 200:
                 raise AIConnectorError(
-                    f"Ollama command failed: {result.stderr}"
+                    f"Ollama request failed ({response.status_code}): {response.text}"
                 )
-            
-            return result.stdout.strip()
-            
-        except subprocess.TimeoutExpired as e:
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                content = chunk.get("message", {}).get("content", "")
+                if content:
+                    yield content
+                if chunk.get("done"):
+                    break
+
+        except requests.Timeout as e:
             raise AIConnectorError("Ollama request timed out") from e
-        except Exception as e:
+        except requests.RequestException as e:
             raise AIConnectorError(f"Failed to generate response: {str(e)}") from e
-    
+
     def list_available_models(self) -> List[str]:
         """
         Liste les modèles disponibles dans Ollama.
-        
+
         Returns:
             Liste des noms de modèles
         """
         if not self.ollama_available:
             return []
-        
-        try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Parse la sortie
-            models = []
-            for line in result.stdout.splitlines()[1:]:  # Ignorer la ligne d'en-tête
-                if line.strip():
-                    model_name = line.split()[0]
-                    models.append(model_name)
-            
-            return models
-            
-        except Exception:
+
+        payload = self._fetch_tags()
+        if not payload:
             return []
-    
+        return [m["name"] for m in payload.get("models", []) if "name" in m]
+
     def check_model_available(self, model_name: str) -> bool:
         """
         Vérifie si un modèle est disponible.
-        
+
         Args:
             model_name: Le nom du modèle
-            
+
         Returns:
             True si le modèle est disponible
         """
         available_models = self.list_available_models()
         return model_name in available_models
-    
+
     def switch_model(self, model_name: str) -> None:
         """
         Change de modèle IA.
-        
+
         Args:
             model_name: Le nom du nouveau modèle
-            
+
         Raises:
             AIConnectorError: Si le modèle n'est pas disponible
         """
@@ -175,7 +208,7 @@ class AIConnector:
                 f"Model '{model_name}' is not available. "
                 f"Available models: {', '.join(self.list_available_models())}"
             )
-        
+
         self.model = model_name
 
 
@@ -2,9 +2,39 @@
 Data Layer: Context Index
 Indexation du code en embeddings avec ChromaDB
 """
+import ast
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+
+    def _manifest_dumps(data: dict) -> bytes:
+        return orjson.dumps(data)
+
+    _manifest_loads = orjson.loads
+except ImportError:  # orjson absent: repli sur le json standard
+    import json
+
+    def _manifest_dumps(data: dict) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    _manifest_loads = json.loads
+
+try:
+    from xxhash import xxh3_64_intdigest as _line_hash
+except ImportError:
+    from zlib import crc32
+
+    def _line_hash(line: str) -> int:
+        # crc32 (C, stable entre processus) en repli de xxhash
+        return crc32(line.encode("utf-8"))
+import re
+import sqlite3
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 try:
     import chromadb
     from chromadb.config import Settings as ChromaSettings
@@ -27,15 +57,36 @@ class ContextIndex:
     Utilise ChromaDB pour stocker les embeddings.
     """
     
-    def __init__(self, persist_directory: Optional[str] = None):
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        *,
+        fast_ingest: bool = False,
+    ):
         if not CHROMADB_AVAILABLE:
             raise ContextIndexError(
                 "ChromaDB is not installed. Install it with: pip install chromadb"
             )
-        
+
         self.persist_directory = persist_directory or str(settings.data_dir / "chroma_db")
         self.client = None
         self.collection = None
+        # Tampon d'ingestion: (id, document, metadata) en attente de flush
+        self._pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        # Ids remplacés lors d'une ré-indexation, à supprimer au flush
+        self._pending_deletes: List[str] = []
+        self._fast_ingest = fast_ingest
+        self._fts: Optional[sqlite3.Connection] = None
+        # Cache LRU des embeddings de requête (clé: texte normalisé)
+        self._embedding_fn = None
+        self._embed_cached = lru_cache(maxsize=1024)(self._embed_query)
+        # Manifeste {file_path: {hash, chunks}} pour sauter les fichiers
+        # inchangés sans interroger Chroma et retrouver les ids de chunks
+        # d'une version précédente lors d'une ré-indexation
+        self._manifest_path = os.path.join(
+            self.persist_directory or ".", "manifest.json"
+        )
+        self._manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
         self._initialize_client()
     
     def _initialize_client(self) -> None:
@@ -47,121 +98,530 @@ class ContextIndex:
                 anonymized_telemetry=False
             ))
             
-            # Crée ou récupère la collection
+            # Crée ou récupère la collection avec les paramètres HNSW
+            # explicites (insertion et requête sous-linéaires à grande échelle)
             self.collection = self.client.get_or_create_collection(
                 name="code_index",
-                metadata={"description": "Codebase semantic index"}
+                metadata={
+                    "description": "Codebase semantic index",
+                    **settings.index_params,
+                }
             )
         except Exception as e:
             raise ContextIndexError(f"Failed to initialize ChromaDB client: {str(e)}")
-    
+
+        if self._fast_ingest:
+            self._apply_fast_ingest_pragmas()
+
+        self._initialize_fts()
+
+    def _initialize_fts(self) -> None:
+        """Ouvre l'index lexical FTS5 (BM25) adossé à l'index dense."""
+        try:
+            os.makedirs(self.persist_directory, exist_ok=True)
+            self._fts = sqlite3.connect(
+                os.path.join(self.persist_directory, "fts.db")
+            )
+            self._fts.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS code_fts "
+                "USING fts5(chunk_id UNINDEXED, body, tokenize='porter unicode61')"
+            )
+        except Exception:
+            # FTS indisponible: la recherche retombe en dense pur
+            self._fts = None
+
+    def _apply_fast_ingest_pragmas(self) -> None:
+        """Relâche la durabilité SQLite de Chroma pour les gros chargements."""
+        try:
+            conn = self.client._sysdb._conn_pool.connect()
+            conn.execute("pragma synchronous = off")
+            conn.execute("pragma journal_mode = memory")
+        except Exception:
+            # Internals de Chroma non disponibles: on ignore silencieusement
+            pass
+
     def index_file(self, file_path: str, file_content: Optional[str] = None) -> None:
         """
         Indexe un fichier dans l'index vectoriel.
-        
+
         Args:
             file_path: Le chemin du fichier à indexer
             file_content: Le contenu du fichier (si None, sera lu)
-            
+
+        Raises:
+            ContextIndexError: Si l'indexation échoue
+        """
+        self.index_files([(file_path, file_content)])
+        self.flush()
+
+    def index_files(
+        self,
+        files: Iterable[Tuple[str, Optional[str]]],
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        Indexe plusieurs fichiers en regroupant les insertions Chroma.
+
+        Une seule transaction par lot de `batch_size` chunks au lieu
+        d'une par fichier.
+
+        Args:
+            files: Itérable de tuples (file_path, file_content ou None)
+            batch_size: Nombre de chunks par lot d'insertion
+
         Raises:
             ContextIndexError: Si l'indexation échoue
         """
-        if file_content is None:
-            try:
-                file_content = file_manager.read_file(file_path)
-            except Exception as e:
-                raise ContextIndexError(f"Failed to read file {file_path}: {str(e)}")
-        
-        # Découpage en chunks pour les gros fichiers
-        chunks = self._split_into_chunks(file_path, file_content)
-        
+        for file_path, file_content in files:
+            if file_content is None:
+                try:
+                    file_content = file_manager.read_file(file_path)
+                except Exception as e:
+                    raise ContextIndexError(f"Failed to read file {file_path}: {str(e)}")
+
+            # Fichier inchangé depuis la dernière indexation: rien à faire
+            file_hash = self._content_hash(file_content)
+            entry = self._manifest.get(file_path) or {}
+            if entry.get("hash") == file_hash:
+                continue
+
+            records = list(self._chunk_records(file_path, file_content))
+            new_ids = [chunk_id for chunk_id, _, _ in records]
+            new_id_set = set(new_ids)
+            previous_set = set(entry.get("chunks") or [])
+            # Les ids adressés par contenu ne se recouvrent pas d'une
+            # version à l'autre: les chunks disparus sont marqués pour
+            # suppression et seuls les nouveaux sont ré-embeddés
+            self._pending_deletes.extend(
+                chunk_id for chunk_id in entry.get("chunks") or []
+                if chunk_id not in new_id_set
+            )
+            self._pending.extend(
+                record for record in records if record[0] not in previous_set
+            )
+            self._manifest[file_path] = {"hash": file_hash, "chunks": new_ids}
+
+            if len(self._pending) >= batch_size:
+                self.flush()
+
+    def index_paths(
+        self,
+        paths: Iterable[str],
+        *,
+        max_workers: int = 8,
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        Indexe une liste de chemins en parallélisant les lectures disque.
+
+        Les lectures (I/O bloquantes, GIL relâché) se recouvrent avec le
+        découpage et l'embedding qui restent sur le thread principal.
+
+        Args:
+            paths: Chemins des fichiers à indexer
+            max_workers: Taille du pool de threads de lecture
+            batch_size: Nombre de chunks par lot d'insertion
+        """
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = executor.map(file_manager.read_file, paths)
+            self.index_files(zip(paths, contents), batch_size=batch_size)
+        self.flush()
+
+    def flush(self) -> None:
+        """Insère les chunks en attente dans l'index en un seul appel."""
+        if not self._pending and not self._pending_deletes:
+            return
+
+        pending, self._pending = self._pending, []
+        deletes, self._pending_deletes = self._pending_deletes, []
         try:
-            # Ajout des chunks à l'index
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{file_path}:{i}"
-                documents.append(chunk)
-                metadatas.append({
+            # Suppression des chunks remplacés avant l'insertion: les ids
+            # adressés par contenu changent avec le contenu, l'upsert seul
+            # laisserait l'ancienne version interrogeable
+            if deletes:
+                self.collection.delete(ids=deletes)
+            if pending:
+                # upsert: tolère un id déjà présent (ex: chunk dupliqué
+                # dans un même fichier) au lieu de lever une erreur
+                writer = getattr(self.collection, "upsert", self.collection.add)
+                writer(
+                    documents=[doc for _, doc, _ in pending],
+                    metadatas=[meta for _, _, meta in pending],
+                    ids=[chunk_id for chunk_id, _, _ in pending],
+                )
+        except Exception as e:
+            raise ContextIndexError(f"Failed to flush index batch: {str(e)}")
+
+        self._save_manifest()
+
+        if self._fts is not None:
+            # FTS5 n'a pas de contrainte d'unicité: on purge les ids
+            # remplacés et ceux qu'on va insérer, sinon chaque
+            # ré-indexation dupliquerait les lignes et fausserait bm25
+            self._fts.executemany(
+                "DELETE FROM code_fts WHERE chunk_id = ?",
+                [(chunk_id,) for chunk_id in deletes]
+                + [(chunk_id,) for chunk_id, _, _ in pending],
+            )
+            self._fts.executemany(
+                "INSERT INTO code_fts VALUES (?, ?)",
+                [(chunk_id, doc) for chunk_id, doc, _ in pending],
+            )
+            self._fts.commit()
+
+    def _chunk_records(
+        self, file_path: str, content: str
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Produit les tuples (chunk_id, texte, metadata) d'un fichier."""
+        chunks = self._split_into_chunks(file_path, content)
+        total = len(chunks)
+        for i, (chunk, start_line, end_line) in enumerate(chunks):
+            chunk_hash = self._content_hash(chunk)
+            # Id adressé par contenu: stable tant que le chunk ne change pas
+            yield (
+                f"{file_path}:{chunk_hash}",
+                chunk,
+                {
                     "file_path": file_path,
                     "chunk_index": i,
-                    "total_chunks": len(chunks)
-                })
-                ids.append(chunk_id)
-            
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+                    "total_chunks": total,
+                    "start_line": start_line,
+                    "end_line": end_line,
+                    "hash": chunk_hash,
+                },
             )
-            
-        except Exception as e:
-            raise ContextIndexError(f"Failed to index file {file_path}: {str(e)}")
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        """Empreinte rapide du contenu (blake2b, plus véloce que sha256)."""
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._manifest_path, "rb") as f:
+                raw = _manifest_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        # Anciens manifestes: la valeur était le hash seul, sans liste
+        # d'ids de chunks (inconnue, donc vide)
+        return {
+            path: entry if isinstance(entry, dict) else {"hash": entry, "chunks": []}
+            for path, entry in raw.items()
+        }
+
+    def _save_manifest(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self._manifest_path), exist_ok=True)
+            with open(self._manifest_path, "wb") as f:
+                f.write(_manifest_dumps(self._manifest))
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Vide les tampons d'ingestion et persiste le manifeste."""
+        self.flush()
+        self._save_manifest()
+        if self._fts is not None:
+            self._fts.close()
+            self._fts = None
     
-    def _split_into_chunks(self, file_path: str, content: str, chunk_size: int = 500) -> List[str]:
+    def _split_into_chunks(
+        self, file_path: str, content: str, chunk_size: int = 4000
+    ) -> List[Tuple[str, int, int]]:
         """
-        Découpe le contenu en chunks de taille raisonnable.
-        
+        Découpe le contenu en chunks sémantiques.
+
+        Pour les fichiers Python, une unité par def/class de premier niveau
+        (découpage aux frontières AST); sinon fenêtres glissantes bornées
+        en caractères.
+
         Args:
             file_path: Le chemin du fichier
             content: Le contenu à découper
-            chunk_size: La taille des chunks (en lignes)
-            
+            chunk_size: Taille maximale d'un chunk (en caractères)
+
         Returns:
-            Liste des chunks
+            Liste de tuples (chunk, start_line, end_line)
         """
+        if Path(file_path).suffix == ".py":
+            chunks = self._split_python_ast(content, chunk_size)
+            if chunks:
+                return chunks
+
+        return self._split_content_defined(content)
+
+    def _split_python_ast(
+        self, content: str, chunk_size: int
+    ) -> Optional[List[Tuple[str, int, int]]]:
+        """Découpe un module Python aux frontières def/class de premier niveau."""
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return None
+
         lines = content.splitlines()
-        chunks = []
-        
-        for i in range(0, len(lines), chunk_size):
-            chunk = "\n".join(lines[i:i + chunk_size])
-            chunks.append(chunk)
-        
+        chunks: List[Tuple[str, int, int]] = []
+        cursor = 0  # dernière ligne (0-based, exclusive) déjà émise
+
+        def emit(start: int, end: int) -> None:
+            """Émet les lignes [start, end) en respectant chunk_size."""
+            segment = "\n".join(lines[start:end])
+            if not segment.strip():
+                return
+            if len(segment) <= chunk_size:
+                chunks.append((segment, start + 1, end))
+            else:
+                # Corps trop volumineux: repli en fenêtres internes
+                for sub, s, e in self._split_line_windows(segment, chunk_size):
+                    chunks.append((sub, start + s, start + e))
+
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                start = min(
+                    node.lineno,
+                    *(d.lineno for d in node.decorator_list),
+                ) - 1 if node.decorator_list else node.lineno - 1
+                if cursor < start:
+                    emit(cursor, start)
+                emit(start, node.end_lineno)
+                cursor = node.end_lineno
+
+        if cursor < len(lines):
+            emit(cursor, len(lines))
+
+        return chunks
+
+    def _split_content_defined(
+        self,
+        content: str,
+        *,
+        avg_chunk_lines: int = 256,
+        min_chunk: int = 64,
+        max_chunk: int = 1000,
+    ) -> List[Tuple[str, int, int]]:
+        """Découpe aux frontières définies par le contenu (hachage par ligne).
+
+        Les frontières ne dépendent que des lignes elles-mêmes: une édition
+        locale ne décale pas les chunks suivants, qui gardent un id stable
+        et échappent au ré-embedding.
+        """
+        chunks: List[Tuple[str, int, int]] = []
+        buffer: List[str] = []
+        start = 1
+        line_no = 0
+
+        for line in content.splitlines():
+            line_no += 1
+            buffer.append(line)
+            if len(buffer) < min_chunk:
+                continue
+            if (
+                len(buffer) >= max_chunk
+                or _line_hash(line) % avg_chunk_lines == 0
+            ):
+                chunks.append(("\n".join(buffer), start, line_no))
+                buffer = []
+                start = line_no + 1
+
+        if buffer:
+            chunks.append(("\n".join(buffer), start, line_no))
+
+        return chunks
+
+    def _split_line_windows(
+        self, content: str, chunk_size: int
+    ) -> List[Tuple[str, int, int]]:
+        """Découpe en fenêtres de lignes bornées à chunk_size caractères.
+
+        Parcourt le contenu avec str.find au lieu de splitlines(): une
+        seule tranche allouée par chunk, pas une str par ligne.
+        """
+        chunks: List[Tuple[str, int, int]] = []
+        length = len(content)
+        pos = 0  # début du chunk courant
+        line = 1  # numéro de ligne (1-based) au début du chunk
+        cursor = 0  # position de lecture
+        cursor_line = 1  # numéro de ligne à la position de lecture
+
+        while cursor < length:
+            newline = content.find("\n", cursor)
+            line_end = length if newline == -1 else newline + 1
+
+            if cursor > pos and line_end - pos > chunk_size:
+                chunks.append((content[pos:cursor].rstrip("\n"), line, cursor_line - 1))
+                pos = cursor
+                line = cursor_line
+
+            cursor = line_end
+            cursor_line += 1
+
+        if pos < length:
+            tail = content[pos:].rstrip("\n")
+            if tail or not chunks:
+                chunks.append((tail, line, cursor_line - 1))
+
         return chunks
     
     def query(self, query_text: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """
-        Recherche dans l'index vectoriel.
-        
+        Recherche hybride dense + lexicale dans l'index.
+
+        Les classements Chroma (cosinus) et FTS5 (BM25) sont fusionnés
+        par Reciprocal Rank Fusion, ce qui rattrape les requêtes par
+        identifiant exact que le dense seul manque.
+
         Args:
             query_text: La requête de recherche
             n_results: Nombre de résultats à retourner
-            
+
         Returns:
             Liste des résultats avec métadonnées
         """
         try:
-            results = self.collection.query(
-                query_texts=[query_text],
-                n_results=n_results
+            fetch_n = n_results * 3 if self._fts is not None else n_results
+            query_vec = self._embed_cached(
+                re.sub(r"\s+", " ", query_text.strip().lower())
             )
-            
-            # Formatage des résultats
-            formatted_results = []
-            
+            if query_vec is not None:
+                results = self.collection.query(
+                    query_embeddings=[list(query_vec)],
+                    n_results=fetch_n,
+                )
+            else:
+                results = self.collection.query(
+                    query_texts=[query_text],
+                    n_results=fetch_n,
+                )
+
+            # Classement dense: chunk_id -> (document, distance, metadata)
+            dense: Dict[str, Dict[str, Any]] = {}
+            dense_rank: List[str] = []
             if results['documents'] and results['documents'][0]:
+                ids = results.get('ids', [[]])[0]
                 for i in range(len(results['documents'][0])):
-                    formatted_results.append({
+                    chunk_id = ids[i] if i < len(ids) else str(i)
+                    dense[chunk_id] = {
                         "document": results['documents'][0][i],
                         "distance": results['distances'][0][i] if results.get('distances') else None,
                         "metadata": results['metadatas'][0][i] if results.get('metadatas') else {}
-                    })
-            
+                    }
+                    dense_rank.append(chunk_id)
+
+            lexical_rank = self._fts_rank(query_text, n_results * 3)
+            if not lexical_rank:
+                return [dense[cid] for cid in dense_rank[:n_results]]
+
+            # Reciprocal Rank Fusion (k=60, Cormack et al.)
+            k = 60
+            scores: Dict[str, float] = {}
+            for rank, chunk_id in enumerate(dense_rank):
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
+            for rank, chunk_id in enumerate(lexical_rank):
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
+
+            fused = sorted(scores, key=scores.get, reverse=True)
+            formatted_results = []
+            for chunk_id in fused:
+                entry = dense.get(chunk_id)
+                if entry is None:
+                    entry = self._fetch_fts_document(chunk_id)
+                    if entry is None:
+                        continue
+                formatted_results.append(entry)
+                if len(formatted_results) >= n_results:
+                    break
+
             return formatted_results
-            
+
         except Exception as e:
             raise ContextIndexError(f"Failed to query index: {str(e)}")
+
+    def _embed_query(self, normalized_text: str) -> Optional[tuple]:
+        """Calcule l'embedding d'une requête normalisée (mis en cache LRU)."""
+        try:
+            if self._embedding_fn is None:
+                from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+                self._embedding_fn = DefaultEmbeddingFunction()
+            return tuple(self._embedding_fn([normalized_text])[0])
+        except Exception:
+            # Modèle d'embedding indisponible: Chroma embarquera lui-même
+            return None
+
+    def query_cache_clear(self) -> None:
+        """Vide le cache d'embeddings de requête."""
+        self._embed_cached.cache_clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques du cache d'embeddings (taux de hit, taille)."""
+        info = self._embed_cached.cache_info()
+        total = info.hits + info.misses
+        return {
+            "embedding_cache_hits": info.hits,
+            "embedding_cache_misses": info.misses,
+            "embedding_cache_hit_rate": info.hits / total if total else 0.0,
+            "embedding_cache_size": info.currsize,
+        }
+
+    def _fts_rank(self, query_text: str, limit: int) -> List[str]:
+        """Classement BM25 des chunk_ids pour la requête, ou liste vide."""
+        if self._fts is None:
+            return []
+        try:
+            rows = self._fts.execute(
+                "SELECT chunk_id FROM code_fts WHERE code_fts MATCH ? "
+                "ORDER BY rank LIMIT ?",
+                (query_text, limit),
+            ).fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.Error:
+            # Requête non analysable par FTS5 (syntaxe spéciale, etc.)
+            return []
+
+    def _fetch_fts_document(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère un chunk présent seulement dans le classement lexical."""
+        if self._fts is None:
+            return None
+        row = self._fts.execute(
+            "SELECT body FROM code_fts WHERE chunk_id = ? LIMIT 1",
+            (chunk_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"document": row[0], "distance": None, "metadata": {}}
     
+    def rebuild_index(self) -> None:
+        """Recompacte l'index HNSW après un chargement en masse."""
+        self.flush()
+        try:
+            # Chroma reconstruit l'index à la demande via une requête;
+            # on force un passage pour matérialiser le graphe HNSW
+            self.collection.query(query_texts=["warmup"], n_results=1)
+        except Exception:
+            pass
+
     def clear_index(self) -> None:
         """Vide l'index complet"""
         try:
             self.collection.delete()
+            # Mêmes métadonnées qu'à l'initialisation: la collection
+            # recréée conserve les paramètres HNSW configurés
             self.collection = self.client.create_collection(
                 name="code_index",
-                metadata={"description": "Codebase semantic index"}
+                metadata={
+                    "description": "Codebase semantic index",
+                    **settings.index_params,
+                }
             )
+            # Réinitialise le manifeste blake2b: sans quoi les fichiers
+            # inchangés resteraient ignorés par index_file après le clear
+            self._manifest = {}
+            self._save_manifest()
+            # Purge aussi l'index lexical FTS5, sinon la recherche
+            # hybride continuerait de remonter des chunks supprimés
+            if self._fts is not None:
+                self._fts.execute("DELETE FROM code_fts")
+                self._fts.commit()
         except Exception as e:
             raise ContextIndexError(f"Failed to clear index: {str(e)}")
 
@@ -7,7 +7,105 @@ from pathlib import Path
 from typing import Optional, List, Tuple
 import subprocess
 import tempfile
+
+try:
+    # Implémentation C du matcher de difflib (API identique)
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:
+    _SequenceMatcher = difflib.SequenceMatcher
+
+try:
+    import diff_match_patch as _dmp_module
+except ImportError:
+    _dmp_module = None
+
+try:
+    # Bindings libgit2 in-process: pas de fork git par checkpoint
+    import pygit2 as _pygit2
+except ImportError:
+    _pygit2 = None
+
+try:
+    # Myers bit-parallèle (SIMD) pour le détail intra-ligne
+    from rapidfuzz.distance import Levenshtein as _Levenshtein
+except ImportError:
+    _Levenshtein = None
+
+try:
+    import numpy as _np
+    import numba as _numba
+except ImportError:
+    _np = None
+    _numba = None
+
+# Codes numériques des opcodes pour le chemin Numba
+_OP_EQUAL, _OP_DELETE, _OP_INSERT, _OP_REPLACE = 0, 1, 2, 3
+_OP_CODES = {"equal": _OP_EQUAL, "delete": _OP_DELETE,
+             "insert": _OP_INSERT, "replace": _OP_REPLACE}
+# En deçà de ce nombre d'opcodes, la compilation JIT ne s'amortit pas
+_NUMBA_OPCODE_THRESHOLD = 500
+
+if _numba is not None:
+    @_numba.njit(cache=True)
+    def _expand_opcodes(ops):  # pragma: no cover - nécessite numba
+        """Déroule les opcodes en tableaux (ligne, idx old, idx new, type)."""
+        total = 0
+        for k in range(ops.shape[0]):
+            tag = ops[k, 0]
+            if tag == 1:
+                total += ops[k, 2] - ops[k, 1]
+            elif tag == 2:
+                total += ops[k, 4] - ops[k, 3]
+            elif tag == 3:
+                a = ops[k, 2] - ops[k, 1]
+                b = ops[k, 4] - ops[k, 3]
+                total += a if a > b else b
+
+        line_nums = _np.empty(total, _np.int64)
+        old_idxs = _np.empty(total, _np.int64)
+        new_idxs = _np.empty(total, _np.int64)
+        types = _np.empty(total, _np.int64)
+        pos = 0
+        line_num = 1
+        for k in range(ops.shape[0]):
+            tag = ops[k, 0]
+            i1, i2, j1, j2 = ops[k, 1], ops[k, 2], ops[k, 3], ops[k, 4]
+            if tag == 0:
+                line_num += i2 - i1
+            elif tag == 1:
+                for i in range(i1, i2):
+                    line_nums[pos] = line_num
+                    old_idxs[pos] = i
+                    new_idxs[pos] = -1
+                    types[pos] = 1
+                    line_num += 1
+                    pos += 1
+            elif tag == 2:
+                for j in range(j1, j2):
+                    line_nums[pos] = line_num
+                    old_idxs[pos] = -1
+                    new_idxs[pos] = j
+                    types[pos] = 2
+                    line_num += 1
+                    pos += 1
+            else:
+                span_old = i2 - i1
+                span_new = j2 - j1
+                span = span_old if span_old > span_new else span_new
+                for kk in range(span):
+                    line_nums[pos] = line_num
+                    old_idxs[pos] = i1 + kk if kk < span_old else -1
+                    new_idxs[pos] = j1 + kk if kk < span_new else -1
+                    types[pos] = 3
+                    line_num += 1
+                    pos += 1
+        return line_nums, old_idxs, new_idxs, types
+
 from domain.entities import DiffResult, DiffLine, DiffType
+
+# Au-delà de cette taille, le diff ligne à ligne passe par diff-match-patch
+# (Myers en C) quand il est disponible
+_LARGE_FILE_LINES = 50_000
 from core.file_manager import file_manager
 from core.settings import settings
 
@@ -25,10 +123,18 @@ class DiffEngine:
     
     def __init__(self, project_root: Optional[str] = None):
         self.project_root = Path(project_root) if project_root else Path.cwd()
+        self._repo = None
         self.git_available = self._check_git_availability()
-    
+
     def _check_git_availability(self) -> bool:
         """Vérifie si Git est disponible"""
+        if _pygit2 is not None:
+            try:
+                self._repo = _pygit2.Repository(str(self.project_root))
+                return True
+            except Exception:
+                self._repo = None
+
         try:
             subprocess.run(
                 ["git", "--version"],
@@ -58,72 +164,181 @@ class DiffEngine:
             Un DiffResult contenant les différences
         """
         result = DiffResult(file_path=file_path)
-        
+
         if old_content == new_content:
             return result
-        
-        # Utilisation de difflib pour calculer les différences
-        old_lines = old_content.splitlines(keepends=True)
-        new_lines = new_content.splitlines(keepends=True)
-        
-        diff = difflib.unified_diff(
-            old_lines,
-            new_lines,
-            fromfile=f'a/{file_path}',
-            tofile=f'b/{file_path}',
-            lineterm=''
-        )
-        
-        # Analyse des différences ligne par ligne
+
+        # Découpage unique, sans fins de ligne: chaque consommateur
+        # appelait .rstrip() de toute façon
+        old_lines = old_content.splitlines()
+        new_lines = new_content.splitlines()
+
+        if (
+            _dmp_module is not None
+            and max(len(old_lines), len(new_lines)) > _LARGE_FILE_LINES
+        ):
+            return self._compute_diff_dmp(old_lines, new_lines, result)
+
+        # autojunk désactivé: son heuristique déclenche à tort sur les
+        # lignes répétitives du code (imports, accolades, etc.)
+        matcher = _SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+        opcodes = matcher.get_opcodes()
+        if _numba is not None and len(opcodes) > _NUMBA_OPCODE_THRESHOLD:
+            return self._expand_opcodes_numba(opcodes, old_lines, new_lines, result)
+
+        # Variables locales dans la boucle chaude (LOAD_FAST vs LOAD_GLOBAL)
+        diff_line = DiffLine
+        removed = DiffType.REMOVED
+        added = DiffType.ADDED
+        modified = DiffType.MODIFIED
+        diff_lines = result.diff_lines
+
         line_num = 1
-        old_idx = 0
-        new_idx = 0
-        
-        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
-        
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == 'equal':
                 line_num += (i2 - i1)
-                old_idx = i2
-                new_idx = j2
             elif tag == 'delete':
-                for i in range(i1, i2):
-                    result.add_diff_line(DiffLine(
-                        line_number=line_num,
+                diff_lines.extend([
+                    diff_line(
+                        line_number=line_num + (i - i1),
                         old_content=old_lines[i].rstrip(),
                         new_content="",
-                        diff_type=DiffType.REMOVED
-                    ))
-                    line_num += 1
-                old_idx = i2
+                        diff_type=removed
+                    )
+                    for i in range(i1, i2)
+                ])
+                result.removed_lines += (i2 - i1)
+                line_num += (i2 - i1)
             elif tag == 'insert':
-                for j in range(j1, j2):
-                    result.add_diff_line(DiffLine(
-                        line_number=line_num,
+                diff_lines.extend([
+                    diff_line(
+                        line_number=line_num + (j - j1),
                         old_content="",
                         new_content=new_lines[j].rstrip(),
-                        diff_type=DiffType.ADDED
-                    ))
-                    line_num += 1
-                new_idx = j2
+                        diff_type=added
+                    )
+                    for j in range(j1, j2)
+                ])
+                result.added_lines += (j2 - j1)
+                line_num += (j2 - j1)
             elif tag == 'replace':
                 # Lignes modifiées
                 max_len = max(i2 - i1, j2 - j1)
-                for k in range(max_len):
-                    old_line = old_lines[i1 + k] if (i1 + k) < i2 else ""
-                    new_line = new_lines[j1 + k] if (j1 + k) < j2 else ""
+                diff_lines.extend([
+                    diff_line(
+                        line_number=line_num + k,
+                        old_content=old_lines[i1 + k].rstrip() if (i1 + k) < i2 else "",
+                        new_content=new_lines[j1 + k].rstrip() if (j1 + k) < j2 else "",
+                        diff_type=modified,
+                        context=self._inline_opcodes(
+                            old_lines[i1 + k] if (i1 + k) < i2 else "",
+                            new_lines[j1 + k] if (j1 + k) < j2 else "",
+                        )
+                    )
+                    for k in range(max_len)
+                ])
+                result.modified_lines += max_len
+                line_num += max_len
+
+        return result
+
+    def _expand_opcodes_numba(
+        self,
+        opcodes: List[Tuple[str, int, int, int, int]],
+        old_lines: List[str],
+        new_lines: List[str],
+        result: DiffResult,
+    ) -> DiffResult:
+        """Déroule les opcodes via la boucle JIT compilée (gros diffs)."""
+        ops = _np.array(
+            [(_OP_CODES[tag], i1, i2, j1, j2) for tag, i1, i2, j1, j2 in opcodes],
+            dtype=_np.int64,
+        )
+        line_nums, old_idxs, new_idxs, types = _expand_opcodes(ops)
+
+        type_map = {1: DiffType.REMOVED, 2: DiffType.ADDED, 3: DiffType.MODIFIED}
+        result.diff_lines.extend([
+            DiffLine(
+                line_number=int(line_nums[k]),
+                old_content=old_lines[old_idxs[k]].rstrip() if old_idxs[k] >= 0 else "",
+                new_content=new_lines[new_idxs[k]].rstrip() if new_idxs[k] >= 0 else "",
+                diff_type=type_map[int(types[k])],
+            )
+            for k in range(len(line_nums))
+        ])
+        result.removed_lines += int((types == 1).sum())
+        result.added_lines += int((types == 2).sum())
+        result.modified_lines += int((types == 3).sum())
+        return result
+
+    @staticmethod
+    def _inline_opcodes(old_line: str, new_line: str) -> Optional[str]:
+        """Opcodes caractère à caractère d'une ligne modifiée (pour le surlignage UI)."""
+        if _Levenshtein is None or not old_line or not new_line:
+            return None
+        return ";".join(
+            f"{tag}:{i1}-{i2}:{j1}-{j2}"
+            for tag, i1, i2, j1, j2 in _Levenshtein.opcodes(old_line, new_line)
+            if tag != "equal"
+        )
+
+    def _compute_diff_dmp(
+        self,
+        old_lines: List[str],
+        new_lines: List[str],
+        result: DiffResult,
+    ) -> DiffResult:
+        """Diff ligne à ligne via diff-match-patch (Myers C) pour très gros fichiers."""
+        dmp = _dmp_module.diff_match_patch()
+        old_text = "\n".join(old_lines) + "\n"
+        new_text = "\n".join(new_lines) + "\n"
+        chars1, chars2, line_array = dmp.diff_linesToChars(old_text, new_text)
+        diffs = dmp.diff_main(chars1, chars2, False)
+        dmp.diff_charsToLines(diffs, line_array)
+
+        line_num = 1
+        i = 0
+        while i < len(diffs):
+            op, text = diffs[i]
+            block = text.splitlines()
+            if op == 0:
+                line_num += len(block)
+            elif op == -1:
+                # Suppression suivie d'une insertion = remplacement
+                if i + 1 < len(diffs) and diffs[i + 1][0] == 1:
+                    new_block = diffs[i + 1][1].splitlines()
+                    for k in range(max(len(block), len(new_block))):
+                        result.add_diff_line(DiffLine(
+                            line_number=line_num,
+                            old_content=block[k].rstrip() if k < len(block) else "",
+                            new_content=new_block[k].rstrip() if k < len(new_block) else "",
+                            diff_type=DiffType.MODIFIED
+                        ))
+                        line_num += 1
+                    i += 1
+                else:
+                    for line in block:
+                        result.add_diff_line(DiffLine(
+                            line_number=line_num,
+                            old_content=line.rstrip(),
+                            new_content="",
+                            diff_type=DiffType.REMOVED
+                        ))
+                        line_num += 1
+            else:
+                for line in block:
                     result.add_diff_line(DiffLine(
                         line_number=line_num,
-                        old_content=old_line.rstrip() if old_line else "",
-                        new_content=new_line.rstrip() if new_line else "",
-                        diff_type=DiffType.MODIFIED
+                        old_content="",
+                        new_content=line.rstrip(),
+                        diff_type=DiffType.ADDED
                     ))
                     line_num += 1
-                old_idx = i2
-                new_idx = j2
-        
+            i += 1
+
         return result
-    
+
     def compute_file_diff(self, file_path: str, new_content: str) -> DiffResult:
         """
         Calcule le diff d'un fichier existant avec un nouveau contenu.
@@ -150,7 +365,10 @@ class DiffEngine:
         """
         if not self.git_available or not settings.enable_rollback:
             return None
-        
+
+        if self._repo is not None:
+            return self._create_checkpoint_pygit2()
+
         try:
             # Vérifie si on est dans un repo Git
             result = subprocess.run(
@@ -198,7 +416,26 @@ class DiffEngine:
             
         except Exception as e:
             return None
-    
+
+    def _create_checkpoint_pygit2(self) -> Optional[str]:
+        """Crée le commit de checkpoint via libgit2, sans subprocess."""
+        try:
+            repo = self._repo
+            index = repo.index
+            index.add_all()
+            index.write()
+            tree = index.write_tree()
+            try:
+                sig = repo.default_signature
+            except Exception:
+                sig = _pygit2.Signature("aihomecoder", "aihomecoder@localhost")
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            commit_msg = f"aihomecoder checkpoint: {Path.cwd().name}"
+            oid = repo.create_commit("HEAD", sig, sig, commit_msg, tree, parents)
+            return str(oid)
+        except Exception:
+            return None
+
     def rollback_to_checkpoint(self, checkpoint_hash: str) -> bool:
         """
         Effectue un rollback vers un checkpoint.
@@ -211,7 +448,17 @@ class DiffEngine:
         """
         if not self.git_available:
             return False
-        
+
+        if self._repo is not None:
+            try:
+                self._repo.reset(
+                    _pygit2.Oid(hex=checkpoint_hash),
+                    _pygit2.GIT_RESET_HARD,
+                )
+                return True
+            except Exception:
+                return False
+
         try:
             result = subprocess.run(
                 ["git", "reset", "--hard", checkpoint_hash],
@@ -226,5 +473,22 @@ class DiffEngine:
             return False
 
 
-# Instance globale du moteur de diff
-diff_engine = DiffEngine()
+class _LazyProxy:
+    """Instancie la cible au premier accès d'attribut.
+
+    Évite le fork `git --version` payé à chaque import du module
+    quand le moteur n'est finalement pas utilisé.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+
+    def __getattr__(self, name):
+        if self._instance is None:
+            self._instance = self._factory()
+        return getattr(self._instance, name)
+
+
+# Instance globale du moteur de diff (initialisée au premier accès)
+diff_engine = _LazyProxy(DiffEngine)
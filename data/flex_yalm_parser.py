@@ -6,21 +6,57 @@ Parser tolérant pour missions YAML ou prompt-only.
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # LibYAML absent: parser pur Python
+    from yaml import SafeLoader as _SafeLoader
+
 from core.file_manager import FileManagerError, file_manager
 from domain.entities import Mission, Task
 from .yaml_parser import YAMLParser, YAMLParserError
 
 
+# Regex de slugification précompilée; "[^a-z0-9]+" remplace déjà les
+# séquences entières, la passe "_+" historique était redondante
+_SLUG_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Clés réservées des mappings de tâche (hoistées: pas de set alloué par tâche)
+_RESERVED_TASK_KEYS = frozenset({
+    "name", "title", "id", "goal", "prompt", "description", "summary",
+    "task_type", "type", "parameters",
+})
+
+# Listes de clés candidates pour _pick_first (tuples figés)
+_NAME_KEYS = ("name", "title", "id")
+_GOAL_KEYS = ("goal", "prompt", "description", "summary")
+_TYPE_KEYS = ("task_type", "type")
+
+
 class FlexYALMParserError(YAMLParserError):
     """Exception levée lors d'une erreur de parsing flexible."""
 
 
+@dataclass(slots=True)
+class TaskBlueprint:
+    """Tâche normalisée en attente de construction.
+
+    Slots plutôt que dict: accès attribut en offset C et empreinte
+    mémoire réduite pour les missions à nombreuses tâches.
+    """
+
+    name: str
+    goal: str
+    task_type: str = "instruction"
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
 class FlexYALMParser:
     """Parser souple capable d'interpréter des missions partielles ou prompt-only."""
 
@@ -78,7 +114,7 @@ class FlexYALMParser:
 
     def _safe_load(self, content: str) -> Any:
         try:
-            return yaml.safe_load(content)
+            return yaml.load(content, Loader=_SafeLoader)
         except yaml.YAMLError as exc:
             raise FlexYALMParserError(f"Invalid YAML syntax: {exc}") from exc
 
@@ -133,7 +169,7 @@ class FlexYALMParser:
             description_hint = (
                 raw.get("description")
                 or raw_meta.get("description")
-                or (tasks[0]["goal"] if tasks else "")
+                or (tasks[0].goal if tasks else "")
             )
 
             if raw.get("prompt") and not explicit_tasks:
@@ -159,7 +195,7 @@ class FlexYALMParser:
             warnings.append("Root YAML list interpreted as sequential instructions.")
             warnings.extend(task_warnings)
             meta = self._build_meta({}, fallback_name=fallback_name, source=source)
-            description_hint = tasks[0]["goal"] if tasks else ""
+            description_hint = tasks[0].goal if tasks else ""
             mode = "prompt_list"
 
         elif isinstance(raw, str):
@@ -174,7 +210,7 @@ class FlexYALMParser:
             warnings.append("Root YAML string interpreted as single instruction.")
             warnings.extend(task_warnings)
             meta = self._build_meta({}, fallback_name=fallback_name, source=source)
-            description_hint = tasks[0]["goal"] if tasks else ""
+            description_hint = tasks[0].goal if tasks else ""
             mode = "prompt_only"
 
         elif raw is None:
@@ -203,7 +239,7 @@ class FlexYALMParser:
             "warnings": warnings,
             "task_count": len(tasks),
             "provided_sections": provided_sections,
-            "primary_prompt": tasks[0]["goal"] if tasks else "",
+            "primary_prompt": tasks[0].goal if tasks else "",
             "fallback_chain": fallback_trace,
         }
 
@@ -235,10 +271,10 @@ class FlexYALMParser:
 
         for blueprint in normalized["tasks"]:
             task = Task(
-                name=blueprint["name"],
-                goal=blueprint["goal"],
-                task_type=blueprint.get("task_type", "instruction"),
-                parameters=blueprint.get("parameters", {}),
+                name=blueprint.name,
+                goal=blueprint.goal,
+                task_type=blueprint.task_type,
+                parameters=blueprint.parameters,
             )
             mission.add_task(task)
 
@@ -302,8 +338,8 @@ class FlexYALMParser:
             return list(value)
         return [value]
 
-    def _build_task_blueprints(self, raw_tasks: List[Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
-        blueprints: List[Dict[str, Any]] = []
+    def _build_task_blueprints(self, raw_tasks: List[Any]) -> Tuple[List[TaskBlueprint], List[str]]:
+        blueprints: List[TaskBlueprint] = []
         warnings: List[str] = []
 
         for index, raw_task in enumerate(raw_tasks, start=1):
@@ -314,25 +350,22 @@ class FlexYALMParser:
 
         return blueprints, warnings
 
-    def _coerce_task_blueprint(self, index: int, raw_task: Any) -> Dict[str, Any]:
+    def _coerce_task_blueprint(self, index: int, raw_task: Any) -> TaskBlueprint:
         if isinstance(raw_task, Task):
-            return {
-                "name": raw_task.name,
-                "goal": raw_task.goal,
-                "task_type": raw_task.task_type,
-                "parameters": raw_task.parameters,
-            }
+            return TaskBlueprint(
+                name=raw_task.name,
+                goal=raw_task.goal,
+                task_type=raw_task.task_type,
+                parameters=raw_task.parameters,
+            )
 
         if isinstance(raw_task, dict):
             name = self._pick_first(
                 raw_task,
-                ["name", "title", "id"],
+                _NAME_KEYS,
                 default=f"task_{index}",
             )
-            goal_value = self._pick_first(
-                raw_task,
-                ["goal", "prompt", "description", "summary"],
-            )
+            goal_value = self._pick_first(raw_task, _GOAL_KEYS)
 
             if isinstance(goal_value, list):
                 goal = " ".join(str(item).strip() for item in goal_value if str(item).strip())
@@ -345,7 +378,7 @@ class FlexYALMParser:
                 )
 
             task_type = str(
-                self._pick_first(raw_task, ["task_type", "type"], default="instruction")
+                self._pick_first(raw_task, _TYPE_KEYS, default="instruction")
             )
 
             parameters = raw_task.get("parameters")
@@ -357,27 +390,22 @@ class FlexYALMParser:
                 params = {"value": parameters}
 
             for key, value in raw_task.items():
-                if key in {"name", "title", "id", "goal", "prompt", "description", "summary", "task_type", "type", "parameters"}:
+                if key in _RESERVED_TASK_KEYS:
                     continue
                 params[key] = value
 
-            return {
-                "name": name,
-                "goal": goal,
-                "task_type": task_type,
-                "parameters": params,
-            }
+            return TaskBlueprint(
+                name=name,
+                goal=goal,
+                task_type=task_type,
+                parameters=params,
+            )
 
         if isinstance(raw_task, str):
             goal = raw_task.strip()
             if not goal:
                 raise FlexYALMParserError(f"Task {index}: empty instruction string.")
-            return {
-                "name": f"task_{index}",
-                "goal": goal,
-                "task_type": "instruction",
-                "parameters": {},
-            }
+            return TaskBlueprint(name=f"task_{index}", goal=goal)
 
         raise FlexYALMParserError(
             f"Task {index}: unsupported structure '{type(raw_task).__name__}'."
@@ -424,7 +452,7 @@ class FlexYALMParser:
     def _pick_first(
         self,
         mapping: Dict[str, Any],
-        keys: List[str],
+        keys: Tuple[str, ...],
         *,
         default: Optional[str] = None,
     ) -> Optional[Any]:
@@ -437,13 +465,13 @@ class FlexYALMParser:
     def _slugify(self, value: Optional[str]) -> str:
         if not value:
             return ""
-        value = value.strip().lower()
-        value = re.sub(r"[^a-z0-9]+", "_", value)
-        value = re.sub(r"_+", "_", value).strip("_")
+        value = _SLUG_NON_ALNUM.sub("_", value.strip().lower()).strip("_")
         return value or ""
 
 
-# Instance utilitaire optionnelle
-flex_yaml_parser = FlexYALMParser()
+from .diff_engine import _LazyProxy  # noqa: E402  (proxy partagé du module voisin)
+
+# Instance utilitaire optionnelle (initialisée au premier accès)
+flex_yaml_parser = _LazyProxy(FlexYALMParser)
 
 
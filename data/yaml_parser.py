@@ -2,12 +2,41 @@
 Data Layer: YAML Parser
 Lecture et validation des fichiers .yalm
 """
+import copy
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import yaml
 from pathlib import Path
 from typing import Dict, Any, List
 from domain.entities import Mission, Task
 from core.file_manager import file_manager, FileManagerError
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # LibYAML absent: parser pur Python
+    from yaml import SafeLoader as _SafeLoader
+
+# Backend de parsing résolu à l'import, du plus rapide au plus portable:
+# rustyyaml (Rust) > CSafeLoader (libyaml) > SafeLoader (pur Python)
+try:
+    import rustyyaml as _rustyyaml
+
+    def _load_yaml(content: str) -> Any:
+        return _rustyyaml.safe_load(content)
+
+    _YAML_BACKEND = "rustyyaml"
+except ImportError:
+    _rustyyaml = None
+
+    def _load_yaml(content: str) -> Any:
+        return yaml.load(content, Loader=_SafeLoader)
+
+    _YAML_BACKEND = _SafeLoader.__name__
+
+logging.getLogger(__name__).debug("YAML backend selected: %s", _YAML_BACKEND)
+
 
 class YAMLParserError(Exception):
     """Exception pour les erreurs de parsing YAML"""
@@ -17,8 +46,17 @@ class YAMLParserError(Exception):
 class YAMLParser:
     """
     Parseur pour les fichiers .yalm (YAML-based task definitions).
+
+    Le backend de parsing est choisi à l'import du module: rustyyaml
+    si installé, sinon le CSafeLoader de libyaml, sinon le SafeLoader
+    pur Python de PyYAML.
     """
-    
+
+    def __init__(self):
+        # Missions déjà construites, clé (chemin, mtime_ns, taille)
+        self._mission_cache: Dict[tuple, Mission] = {}
+
+
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """
         Parse un fichier .yalm et retourne son contenu.
@@ -32,11 +70,37 @@ class YAMLParser:
         Raises:
             YAMLParserError: Si le fichier ne peut pas être parsé
         """
+        if _rustyyaml is None:
+            # libyaml parse directement le descripteur: pas de str
+            # intermédiaire matérialisée
+            return self.parse_stream(file_path)
+
         try:
             content = file_manager.read_file(file_path)
             return self.parse_content(content)
         except FileManagerError as e:
             raise YAMLParserError(f"Failed to read YAML file: {str(e)}")
+
+    def parse_stream(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse un fichier YAML en streaming depuis son descripteur.
+
+        Args:
+            file_path: Le chemin du fichier à parser
+
+        Returns:
+            Le contenu parsé
+
+        Raises:
+            YAMLParserError: Si le fichier ne peut pas être lu ou parsé
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                return yaml.load(f, Loader=_SafeLoader) or {}
+        except yaml.YAMLError as e:
+            raise YAMLParserError(f"Invalid YAML syntax: {str(e)}")
+        except OSError as e:
+            raise YAMLParserError(f"Failed to read YAML file: {str(e)}")
     
     def parse_content(self, content: str) -> Dict[str, Any]:
         """
@@ -52,10 +116,39 @@ class YAMLParser:
             YAMLParserError: Si le contenu ne peut pas être parsé
         """
         try:
-            return yaml.safe_load(content) or {}
+            return _load_yaml(content) or {}
         except yaml.YAMLError as e:
             raise YAMLParserError(f"Invalid YAML syntax: {str(e)}")
+        except ValueError as e:
+            # Erreur de syntaxe levée par un backend alternatif
+            raise YAMLParserError(f"Invalid YAML syntax: {str(e)}")
     
+    def parse_files(self, paths: List[str]) -> List[tuple]:
+        """
+        Parse plusieurs fichiers YAML en parallèle.
+
+        Chaque fichier est indépendant et libyaml relâche le GIL dans
+        son scanner C, donc les parses se recouvrent sur plusieurs cœurs.
+        Les erreurs restent isolées par fichier.
+
+        Args:
+            paths: Les chemins des fichiers à parser
+
+        Returns:
+            Liste de tuples (path, contenu parsé ou YAMLParserError)
+        """
+        def parse_one(path: str):
+            try:
+                return (path, self.parse_file(path))
+            except YAMLParserError as e:
+                return (path, e)
+
+        if len(paths) <= 1:
+            return [parse_one(p) for p in paths]
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(parse_one, paths))
+
     def create_mission_from_yaml(self, file_path: str) -> Mission:
         """
         Crée une mission à partir d'un fichier .yalm.
@@ -69,130 +162,177 @@ class YAMLParser:
         Raises:
             YAMLParserError: Si le fichier ne peut pas être parsé ou est invalide
         """
+        try:
+            st = os.stat(file_path)
+            key = (file_path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+
+        # Mission déjà construite pour cette version du fichier: on
+        # rend une copie profonde (la mission est mutée à l'exécution)
+        if key is not None:
+            cached = self._mission_cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
         try:
             data = self.parse_file(file_path)
-            return self._build_mission(data)
+            mission = self._build_mission(data)
         except Exception as e:
             raise YAMLParserError(f"Failed to create mission from {file_path}: {str(e)}")
+
+        if key is not None:
+            if len(self._mission_cache) >= 128:
+                self._mission_cache.clear()
+            self._mission_cache[key] = copy.deepcopy(mission)
+        return mission
     
     def _build_mission(self, data: Dict[str, Any]) -> Mission:
         """
         Construit une mission à partir des données parsées.
-        
+
         Args:
             data: Les données parsées du YAML
-            
+
         Returns:
             Une instance de Mission
-            
+
         Raises:
             YAMLParserError: Si les données sont invalides
         """
+        mission, _ = self._build_mission_and_validate(data, build=True)
+        return mission
+
+    def _build_mission_and_validate(
+        self, data: Dict[str, Any], build: bool = True
+    ) -> tuple:
+        """
+        Traverse les données parsées une seule fois: construction de la
+        mission et collecte des erreurs de structure partagent le même
+        parcours au lieu de marcher le dict deux fois.
+
+        Args:
+            data: Les données parsées du YAML
+            build: Si False, ne construit pas la mission (validation seule)
+
+        Returns:
+            Tuple (Mission ou None, liste des erreurs de validation)
+        """
+        errors: List[str] = []
         # Extraction du nom de la mission (support formats alternatifs)
-        meta = data.get("meta", {})
+        if "meta" not in data:
+            errors.append("Missing 'meta' section")
+            meta = {}
+        else:
+            meta = data["meta"]
+            if "project_name" not in meta and "mission_id" not in meta:
+                errors.append("Missing 'meta.project_name' or 'meta.mission_id'")
         mission_name = meta.get("project_name") or meta.get("mission_id") or "Unnamed Mission"
-        
-        # Extraction de la description
-        description = meta.get("description", "")
-        if not description:
-            description = data.get("description", "")
-        
-        # Création de la mission
-        mission = Mission(
-            name=mission_name,
-            description=description,
-            metadata={
-                "version": meta.get("version", "1.0.0"),
-                "author": meta.get("author", ""),
-                "architecture": meta.get("architecture", ""),
-                "language": meta.get("language", ""),
-                # Préserver la section meta complète pour accès à raw_output et autres champs
-                "meta": meta,
-                # Préserver d'autres sections potentielles pour usage ultérieur
-                "context": data.get("context"),
-                "outputs": data.get("outputs"),
-                "post_actions": data.get("post_actions")
-            }
-        )
-        
-        # Extraction des tâches (supporte dicts et chaînes)
+
+        mission = None
+        if build:
+            # Extraction de la description
+            description = meta.get("description", "")
+            if not description:
+                description = data.get("description", "")
+
+            # Création de la mission
+            mission = Mission(
+                name=mission_name,
+                description=description,
+                metadata={
+                    "version": meta.get("version", "1.0.0"),
+                    "author": meta.get("author", ""),
+                    "architecture": meta.get("architecture", ""),
+                    "language": meta.get("language", ""),
+                    # Préserver la section meta complète pour accès à raw_output et autres champs
+                    "meta": meta,
+                    # Préserver d'autres sections potentielles pour usage ultérieur
+                    "context": data.get("context"),
+                    "outputs": data.get("outputs"),
+                    "post_actions": data.get("post_actions")
+                }
+            )
+
+        if "tasks" not in data:
+            errors.append("Missing 'tasks' section")
+
+        # Extraction des tâches (supporte dicts et chaînes).
+        # Boucle chaude sur grosses missions: méthodes liées hoistées
+        # hors de la boucle pour éviter les lookups d'attributs répétés.
         tasks_data = data.get("tasks", [])
+        if not isinstance(tasks_data, list):
+            errors.append("'tasks' must be a list")
+            if not build:
+                tasks_data = []
+        add_task = mission.add_task if mission is not None else None
         for index, task_data in enumerate(tasks_data, start=1):
             if isinstance(task_data, dict):
-                task_id = task_data.get("id")
+                if "goal" not in task_data and "name" not in task_data:
+                    errors.append(f"Task {index} must have at least 'goal' or 'name'")
+                if add_task is None:
+                    continue
+                get = task_data.get
+                task_id = get("id")
                 task_type = (
-                    task_data.get("type")
-                    or task_data.get("task_type")
+                    get("type")
+                    or get("task_type")
                     or task_id
                     or "generic"
                 )
-                task_name = task_data.get("name") or task_id or f"task_{index}"
+                task_name = get("name") or task_id or f"task_{index}"
 
-                raw_parameters = task_data.get("parameters")
-                parameters = dict(raw_parameters) if isinstance(raw_parameters, dict) else {}
+                raw_parameters = get("parameters")
+                if not isinstance(raw_parameters, dict):
+                    raw_parameters = None
 
-                if "output" in task_data and task_data.get("output") is not None:
-                    parameters.setdefault("output", task_data.get("output"))
+                output = get("output")
+                if output is not None:
+                    # Copie uniquement quand on doit injecter 'output'
+                    parameters = dict(raw_parameters) if raw_parameters else {}
+                    parameters.setdefault("output", output)
+                else:
+                    # Le dict parsé n'est plus référencé après construction:
+                    # on le réutilise tel quel au lieu de le copier
+                    parameters = raw_parameters if raw_parameters is not None else {}
 
-                task = Task(
+                add_task(Task(
                     name=task_name,
-                    goal=task_data.get("goal", ""),
+                    goal=get("goal", ""),
                     task_type=task_type,
                     parameters=parameters
-                )
-                mission.add_task(task)
+                ))
             elif isinstance(task_data, str):
                 # Mapper une instruction textuelle à une tâche générique
-                task = Task(
-                    name=f"task_{index}",
-                    goal=task_data.strip(),
-                    task_type="instruction",
-                    parameters={}
-                )
-                mission.add_task(task)
-        
-        return mission
-    
+                stripped = task_data.strip()
+                if not stripped:
+                    errors.append(f"Task {index} string is empty")
+                if add_task is not None:
+                    add_task(Task(
+                        name=f"task_{index}",
+                        goal=stripped,
+                        task_type="instruction",
+                        parameters={}
+                    ))
+            else:
+                errors.append(f"Task {index} must be a dictionary or a string")
+
+        return mission, errors
+
     def validate_yaml_structure(self, data: Dict[str, Any]) -> List[str]:
         """
         Valide la structure d'un fichier .yalm.
-        
+
+        Délègue au parcours unique de _build_mission_and_validate
+        (sans construction) pour éviter une double traversée.
+
         Args:
             data: Les données parsées
-            
+
         Returns:
             Liste des erreurs de validation (vide si valide)
         """
-        errors = []
-        
-        # Vérification des sections obligatoires
-        if "meta" not in data:
-            errors.append("Missing 'meta' section")
-        else:
-            meta = data["meta"]
-            # Accepte 'project_name' ou 'mission_id'
-            if "project_name" not in meta and "mission_id" not in meta:
-                errors.append("Missing 'meta.project_name' or 'meta.mission_id'")
-        
-        if "tasks" not in data:
-            errors.append("Missing 'tasks' section")
-        
-        # Vérification des tâches
-        tasks = data.get("tasks", [])
-        if not isinstance(tasks, list):
-            errors.append("'tasks' must be a list")
-        else:
-            for i, task in enumerate(tasks):
-                # Autorise soit dict complet, soit chaîne simple
-                if isinstance(task, dict):
-                    if "goal" not in task and "name" not in task:
-                        errors.append(f"Task {i+1} must have at least 'goal' or 'name'")
-                elif isinstance(task, str):
-                    if not task.strip():
-                        errors.append(f"Task {i+1} string is empty")
-                else:
-                    errors.append(f"Task {i+1} must be a dictionary or a string")
-        
+        _, errors = self._build_mission_and_validate(data, build=False)
         return errors
 
 
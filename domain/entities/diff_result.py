@@ -4,18 +4,29 @@ Représente le résultat d'une comparaison de fichiers
 """
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
-from enum import Enum
+from enum import IntEnum
 
 
-class DiffType(Enum):
-    """Type de modification"""
-    ADDED = "added"
-    REMOVED = "removed"
-    MODIFIED = "modified"
-    UNCHANGED = "unchanged"
+class DiffType(IntEnum):
+    """Type de modification.
 
+    IntEnum avec valeurs 0..3: les membres servent d'index direct dans
+    les tables de préfixes/libellés, sans lookup de dict ni .value.
+    """
+    ADDED = 0
+    REMOVED = 1
+    MODIFIED = 2
+    UNCHANGED = 3
+
+    def __str__(self) -> str:
+        return DIFF_TYPE_STR[self]
+
+
+# Libellés sérialisés, indexés par la valeur du membre
+DIFF_TYPE_STR = ("added", "removed", "modified", "unchanged")
 
-@dataclass
+
+@dataclass(slots=True)
 class DiffLine:
     """Représente une ligne de différence"""
     line_number: int
@@ -30,12 +41,12 @@ class DiffLine:
             "line_number": self.line_number,
             "old_content": self.old_content,
             "new_content": self.new_content,
-            "diff_type": self.diff_type.value,
+            "diff_type": DIFF_TYPE_STR[self.diff_type],
             "context": self.context
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffResult:
     """
     Représente le résultat complet d'une comparaison entre deux fichiers.
@@ -50,11 +61,13 @@ class DiffResult:
     def add_diff_line(self, line: DiffLine) -> None:
         """Ajoute une ligne de différence"""
         self.diff_lines.append(line)
-        if line.diff_type == DiffType.ADDED:
+        # Membres d'Enum singletons: comparaison par identité
+        diff_type = line.diff_type
+        if diff_type is DiffType.ADDED:
             self.added_lines += 1
-        elif line.diff_type == DiffType.REMOVED:
+        elif diff_type is DiffType.REMOVED:
             self.removed_lines += 1
-        elif line.diff_type == DiffType.MODIFIED:
+        elif diff_type is DiffType.MODIFIED:
             self.modified_lines += 1
     
     def get_summary(self) -> str:
@@ -68,31 +81,25 @@ class DiffResult:
         """Génère un diff unifié au format standard"""
         if not self.diff_lines:
             return f"No changes in {self.file_path}\n"
-        
-        lines = [f"--- a/{self.file_path}"]
-        lines.append(f"+++ b/{self.file_path}")
-        lines.append("@@")
-        
+
+        lines = [
+            "--- a/" + self.file_path,
+            "+++ b/" + self.file_path,
+            "@@",
+        ]
+        append = lines.append
         for diff_line in self.diff_lines:
-            prefix = self._get_diff_prefix(diff_line.diff_type)
-            if diff_line.diff_type in [DiffType.REMOVED, DiffType.MODIFIED]:
-                lines.append(f"{prefix} {diff_line.old_content}")
-            if diff_line.diff_type in [DiffType.ADDED, DiffType.MODIFIED]:
-                lines.append(f"{prefix}+{diff_line.new_content}")
-        
+            diff_type = diff_line.diff_type
+            if diff_type is DiffType.MODIFIED:
+                append("- " + diff_line.old_content)
+                append("-+" + diff_line.new_content)
+            elif diff_type is DiffType.REMOVED:
+                append("- " + diff_line.old_content)
+            elif diff_type is DiffType.ADDED:
+                append("++" + diff_line.new_content)
+
         return "\n".join(lines) + "\n"
     
-    @staticmethod
-    def _get_diff_prefix(diff_type: DiffType) -> str:
-        """Retourne le préfixe pour le format unifié"""
-        if diff_type == DiffType.ADDED:
-            return "+"
-        elif diff_type == DiffType.REMOVED:
-            return "-"
-        elif diff_type == DiffType.MODIFIED:
-            return "-"
-        return " "
-    
     def to_dict(self) -> Dict[str, Any]:
         """Convertit le résultat en dictionnaire"""
         return {
@@ -17,7 +17,7 @@ class MissionStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class Mission:
     """
     Une mission regroupe plusieurs tâches à exécuter séquentiellement.
@@ -28,36 +28,58 @@ class Mission:
     tasks: List[Task] = field(default_factory=list)
     status: MissionStatus = MissionStatus.PENDING
     metadata: Dict[str, Any] = field(default_factory=dict)
-    
+    # Index nom -> tâche et statut -> tâches (par nom, ordre d'insertion)
+    # pour des lookups O(1) au lieu de scans linéaires répétés
+    _by_name: Dict[str, Task] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _by_status: Dict[TaskStatus, Dict[str, Task]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validation après initialisation"""
         if not self.name:
             raise ValueError("Mission name cannot be empty")
-    
+        # Indexer les tâches passées au constructeur (ex: from_dict)
+        for task in self.tasks:
+            self._index_task(task)
+
+    def _index_task(self, task: Task) -> None:
+        """Enregistre une tâche dans les index nom et statut"""
+        self._by_name[task.name] = task
+        self._by_status.setdefault(task.status, {})[task.name] = task
+
     def add_task(self, task: Task) -> None:
         """Ajoute une tâche à la mission"""
         self.tasks.append(task)
-    
+        self._index_task(task)
+
+    def set_task_status(self, task: Task, new_status: TaskStatus) -> None:
+        """Change le statut d'une tâche en maintenant l'index par statut"""
+        bucket = self._by_status.get(task.status)
+        if bucket is not None:
+            bucket.pop(task.name, None)
+        task.status = new_status
+        self._by_status.setdefault(new_status, {})[task.name] = task
+
     def get_task_by_name(self, name: str) -> Optional[Task]:
         """Récupère une tâche par son nom"""
-        for task in self.tasks:
-            if task.name == name:
-                return task
-        return None
-    
+        return self._by_name.get(name)
+
     def get_completed_tasks(self) -> List[Task]:
         """Retourne les tâches complétées"""
-        return [t for t in self.tasks if t.status == TaskStatus.COMPLETED]
-    
+        return list(self._by_status.get(TaskStatus.COMPLETED, {}).values())
+
     def get_failed_tasks(self) -> List[Task]:
         """Retourne les tâches échouées"""
-        return [t for t in self.tasks if t.status == TaskStatus.FAILED]
+        return list(self._by_status.get(TaskStatus.FAILED, {}).values())
     
     def get_progress(self) -> float:
         """Retourne le pourcentage de progression (0-100)"""
         if not self.tasks:
             return 100.0
-        completed = len(self.get_completed_tasks())
+        completed = len(self._by_status.get(TaskStatus.COMPLETED, ()))
         return (completed / len(self.tasks)) * 100
     
     def to_dict(self) -> Dict[str, Any]:
@@ -69,6 +91,22 @@ class Mission:
             "status": self.status.value,
             "metadata": self.metadata
         }
+
+    def to_summary_dict(self) -> Dict[str, Any]:
+        """Résumé léger de la mission, sans sérialiser chaque tâche.
+
+        À préférer à to_dict() pour les snapshots et diagnostics
+        fréquents: les compteurs viennent de l'index par statut, donc
+        coût O(1) quel que soit le nombre de tâches.
+        """
+        return {
+            "name": self.name,
+            "status": self.status.value,
+            "task_count": len(self.tasks),
+            "completed": len(self._by_status.get(TaskStatus.COMPLETED, ())),
+            "failed": len(self._by_status.get(TaskStatus.FAILED, ())),
+            "progress": self.get_progress(),
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Mission":
@@ -16,7 +16,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     Une tâche représente une action unique à exécuter.
@@ -49,11 +49,37 @@ class Task:
             "error": self.error
         }
     
+    @classmethod
+    def _unchecked(
+        cls,
+        name: str,
+        goal: str,
+        task_type: str = "generic",
+        parameters: Optional[Dict[str, Any]] = None,
+        status: TaskStatus = TaskStatus.PENDING,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> "Task":
+        """Construit une tâche sans repasser par __post_init__.
+
+        Réservé aux chemins de réhydratation où les valeurs ont déjà
+        été validées (ex: from_dict sur un to_dict antérieur).
+        """
+        task = cls.__new__(cls)
+        task.name = name
+        task.goal = goal
+        task.task_type = task_type
+        task.parameters = parameters if parameters is not None else {}
+        task.status = status
+        task.result = result
+        task.error = error
+        return task
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Task":
         """Crée une tâche à partir d'un dictionnaire"""
         status = TaskStatus(data.get("status", "pending"))
-        return cls(
+        return cls._unchecked(
             name=data["name"],
             goal=data["goal"],
             task_type=data.get("task_type", "generic"),
@@ -28,6 +28,9 @@ class ExecutorService:
         self.on_mission_failed: Optional[Callable[[Mission], None]] = None
         self.handler = TaskLogicHandler()
         self.context_bridge = bridge or shared_context_bridge
+        # Drapeau de coalescence des snapshots de mission (voir
+        # _flush_mission_snapshot)
+        self._snapshot_dirty = False
     
     def execute_mission(
         self,
@@ -67,7 +70,7 @@ class ExecutorService:
         try:
             for task in mission.tasks:
                 if confirmation_needed and not confirmation_callback(task):
-                    task.status = TaskStatus.CANCELLED
+                    mission.set_task_status(task, TaskStatus.CANCELLED)
                     mission.status = MissionStatus.CANCELLED
                     self.context_bridge.publish_diagnostic(
                         "executor.mission",
@@ -137,7 +140,7 @@ class ExecutorService:
         try:
             enforce_task_restrictions(task.goal or "", mode)
         except GuardrailError as exc:
-            task.status = TaskStatus.FAILED
+            mission.set_task_status(task, TaskStatus.FAILED)
             task.error = str(exc)
             self.context_bridge.publish_diagnostic(
                 "executor.task",
@@ -149,19 +152,24 @@ class ExecutorService:
                     "error": str(exc),
                 },
             )
-            self._update_mission_snapshot(mission)
+            self._snapshot_dirty = True
             if self.on_task_failed:
+                self._flush_mission_snapshot(mission)
                 self.on_task_failed(task, exc)
             return False
 
-        task.status = TaskStatus.IN_PROGRESS
-        self.context_bridge.publish_diagnostic(
-            "executor.task",
-            {"event": "started", "task": task.name, "goal": task.goal, "mode": mode},
-        )
-        self._update_mission_snapshot(mission)
-        
+        mission.set_task_status(task, TaskStatus.IN_PROGRESS)
+        # Évite d'allouer les dicts d'événements quand le pont n'enregistre pas
+        diagnostics_on = self.context_bridge.diagnostics_enabled
+        if diagnostics_on:
+            self.context_bridge.publish_diagnostic(
+                "executor.task",
+                {"event": "started", "task": task.name, "goal": task.goal, "mode": mode},
+            )
+        self._snapshot_dirty = True
+
         if self.on_task_started:
+            self._flush_mission_snapshot(mission)
             self.on_task_started(task)
         
         try:
@@ -170,28 +178,32 @@ class ExecutorService:
             result = self._execute_task_logic(task, mission)
             
             task.result = result
-            task.status = TaskStatus.COMPLETED
-            self.context_bridge.publish_diagnostic(
-                "executor.task",
-                {"event": "completed", "task": task.name, "result": result},
-            )
-            self._update_mission_snapshot(mission)
-            
+            mission.set_task_status(task, TaskStatus.COMPLETED)
+            if diagnostics_on:
+                self.context_bridge.publish_diagnostic(
+                    "executor.task",
+                    {"event": "completed", "task": task.name, "result": result},
+                )
+            self._snapshot_dirty = True
+
             if self.on_task_completed:
+                self._flush_mission_snapshot(mission)
                 self.on_task_completed(task)
             
             return True
             
         except Exception as e:
-            task.status = TaskStatus.FAILED
+            mission.set_task_status(task, TaskStatus.FAILED)
             task.error = str(e)
-            self.context_bridge.publish_diagnostic(
-                "executor.task",
-                {"event": "failed", "task": task.name, "error": str(e)},
-            )
-            self._update_mission_snapshot(mission)
-            
+            if diagnostics_on:
+                self.context_bridge.publish_diagnostic(
+                    "executor.task",
+                    {"event": "failed", "task": task.name, "error": str(e)},
+                )
+            self._snapshot_dirty = True
+
             if self.on_task_failed:
+                self._flush_mission_snapshot(mission)
                 self.on_task_failed(task, e)
             
             return False
@@ -246,3 +258,15 @@ class ExecutorService:
         """Expose a snapshot of the bridge state inside mission metadata."""
 
         mission.metadata["context_bridge"] = self.context_bridge.export_snapshot()
+        self._snapshot_dirty = False
+
+    def _flush_mission_snapshot(self, mission: Mission) -> None:
+        """Matérialise le snapshot seulement s'il est marqué sale.
+
+        Les transitions de statut ne font que lever le drapeau; la copie
+        n'a lieu qu'aux frontières de mission ou juste avant un callback
+        susceptible de l'observer.
+        """
+
+        if self._snapshot_dirty:
+            self._update_mission_snapshot(mission)
@@ -1,13 +1,16 @@
 # domain/services/handlers/analysis.py
 from pathlib import Path
-from collections import Counter
+from collections import defaultdict
 import json
 import datetime
 import logging
+import os
+import sys
 from typing import Any, Dict, List, Optional
 
 from core.file_manager import file_manager
 from core.guardrail import guardrail
+from domain.services.helpers import _json_dumps_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -20,25 +23,50 @@ def analyze_workspace(params: Dict[str, Any]) -> str:
     """
     workspace = Path(params.get("workspace_path", params.get("workspace", "."))).resolve()
     depth = int(params.get("depth", 3))
-    stats = Counter()
+    stats: Dict[str, int] = defaultdict(int)
     lines: List[str] = []
 
-    def explore(path: Path, level=0):
+    # Parcours itératif via os.scandir: les DirEntry portent déjà le
+    # type (d_type), donc pas de stat() supplémentaire par entrée.
+    # Les préfixes complets sont précalculés une fois par niveau pour
+    # que chaque ligne se réduise à une concaténation préfixe + nom.
+    dir_prefixes = ["│   " * i + "├── " for i in range(depth + 1)]
+    file_prefixes = ["│   " * (i + 1) for i in range(depth + 1)]
+    splitext = os.path.splitext
+    intern = sys.intern
+
+    # Pile de travail: str = ligne fichier déjà rendue, tuple = dossier
+    # à explorer. Les entrées sont empilées en ordre inverse pour que le
+    # dépilage LIFO reproduise l'ordre trié du parcours récursif.
+    stack: List[Any] = [(str(workspace), workspace.name, 0)]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            lines.append(item)
+            continue
+
+        dir_path, dir_name, level = item
         if level > depth:
-            return
-        indent = "│   " * level
-        lines.append(f"{indent}├── {path.name}/")
+            continue
+        lines.append(dir_prefixes[level] + dir_name + "/")
+
         try:
-            for item in sorted(path.iterdir()):
-                if item.is_dir():
-                    explore(item, level + 1)
-                else:
-                    stats[item.suffix or "[none]"] += 1
-                    lines.append(f"{indent}│   {item.name}")
-        except Exception as exc:
-            logger.debug("explore(): cannot list %s: %s", path, exc, exc_info=True)
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as exc:
+            logger.debug("explore(): cannot list %s: %s", dir_path, exc, exc_info=True)
+            continue
 
-    explore(workspace)
+        file_prefix = file_prefixes[level]
+        next_level = level + 1
+        for entry in reversed(entries):
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((entry.path, entry.name, next_level))
+            else:
+                # Suffixes internés: hash calculé une fois, comparaisons
+                # de clés par identité sur .py/.json/etc. récurrents
+                stats[intern(splitext(entry.name)[1] or "[none]")] += 1
+                stack.append(file_prefix + entry.name)
 
     output_json = params.get("output_data")
     if output_json:
@@ -53,11 +81,10 @@ def analyze_workspace(params: Dict[str, Any]) -> str:
         except Exception:
             logger.debug("Guardrail check_path failed for %s", out_path, exc_info=True)
         try:
-            if hasattr(file_manager, "write_file"):
-                file_manager.write_file(str(out_path), json.dumps(payload, indent=2, ensure_ascii=False))
-            else:
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                out_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+            # Sérialisation en bytes (orjson si dispo) écrite en une
+            # passe: évite l'aller-retour str -> utf-8 du chemin texte
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            out_path.write_bytes(_json_dumps_bytes(payload))
         except Exception as exc:
             logger.error("Failed to write analyze_workspace output: %s", exc)
 
@@ -96,31 +123,41 @@ def generate_markdown(params: Dict[str, Any]) -> str:
     lines = data.get("tree", [])
     stats = data.get("extensions", {})
 
-    md = [
+    header = [
         f"# 🌳 Rapport de Lecture — {Path(workspace).name if workspace else Path('.').name}",
         f"**Date :** {now}",
         f"**Workspace :** {workspace}",
         "",
         "## Arborescence (3 niveaux)",
         "```",
-        *lines,
+    ]
+    footer = [
         "```",
         "",
         "## Extensions détectées",
     ]
-    for ext, count in (stats.items() if isinstance(stats, dict) else []):
-        md.append(f"- **{ext}** : {count} fichier(s)")
-    md.append("\n---\n_Rapport généré par AIHomeCoder v1.0.0_")
 
     try:
         guardrail.check_path(str(report_path), operation="write")
     except Exception:
         logger.debug("Guardrail check_path failed for %s", report_path, exc_info=True)
     try:
-        if hasattr(file_manager, "write_file"):
-            file_manager.write_file(str(report_path), "\n".join(md))
-        else:
-            report_path.write_text("\n".join(md), encoding="utf-8")
+        # Écriture streamée via un gros tampon: le rapport n'est jamais
+        # matérialisé en une seule chaîne
+        with open(report_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            write = f.write
+            for line in header:
+                write(line)
+                write("\n")
+            for line in lines:
+                write(line)
+                write("\n")
+            for line in footer:
+                write(line)
+                write("\n")
+            for ext, count in (stats.items() if isinstance(stats, dict) else []):
+                write(f"- **{ext}** : {count} fichier(s)\n")
+            write("\n---\n_Rapport généré par AIHomeCoder v1.0.0_")
     except Exception as exc:
         logger.error("Failed to write generate_markdown report: %s", exc)
 
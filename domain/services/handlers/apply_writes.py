@@ -3,11 +3,14 @@ from pathlib import Path
 import json
 import datetime
 import logging
+import os
 from typing import Any, Dict, List, Optional
 
 from core.file_manager import file_manager
 from core.guardrail import guardrail
 from domain.services.helpers import (
+    _HAS_ORJSON,
+    _json_dumps_bytes,
     _pick_string,
     _stringify_content,
     _to_bool,
@@ -22,13 +25,54 @@ def _resolve_workspace_path(candidate: Optional[str], context: Dict[str, Any]) -
     return Path(ws_candidate).expanduser().resolve()
 
 
+def _flush_write_batch(fm, pending: List[tuple], errors: List[str]) -> int:
+    """
+    Applique un lot d'écritures différées en une seule soumission.
+
+    Le chemin rapide passe par fm.write_files (mkdir amorti, un seul
+    parcours); en cas d'échec du lot on retombe sur l'écriture unitaire
+    pour isoler l'erreur par fichier.
+
+    Args:
+        fm: file_manager (ou équivalent injecté via le contexte)
+        pending: liste de tuples (entry, target_path, content)
+        errors: accumulateur d'erreurs du rapport
+
+    Returns:
+        Nombre d'écritures appliquées
+    """
+    if not pending:
+        return 0
+
+    if hasattr(fm, "write_files"):
+        try:
+            fm.write_files([(str(path_obj), content) for _, path_obj, content in pending])
+            for entry, _, _ in pending:
+                entry["applied"] = True
+            return len(pending)
+        except Exception:
+            logger.debug("Batched write_files failed, retrying per item", exc_info=True)
+
+    applied = 0
+    for entry, path_obj, content in pending:
+        try:
+            _safe_write_text(fm, path_obj, content, append=False, encoding="utf-8")
+            entry["applied"] = True
+            applied += 1
+        except Exception as we:
+            entry["error"] = f"write_error: {str(we)}"
+            errors.append(str(we))
+    return applied
+
+
 def _read_text(fm, path_obj: Path, encoding: str = "utf-8") -> Optional[str]:
     try:
         # Prefer file_manager API if present
         if hasattr(fm, "read_file"):
             return fm.read_file(str(path_obj))
-        # fallback to Path
-        return path_obj.read_text(encoding=encoding)
+        # fallback: lecture brute en un seul read() puis décodage
+        with open(path_obj, "rb", buffering=0) as f:
+            return f.read().decode(encoding)
     except Exception:
         return None
 
@@ -63,6 +107,29 @@ def task_apply_writes(params: Dict[str, Any], context: Dict[str, Any]) -> str:
     errors: List[str] = []
     applied_count = 0
     simulated_count = 0
+    # Écritures non-append en encodage par défaut, différées pour être
+    # soumises en un seul lot après la boucle de validation. Le lot est
+    # vidé dès qu'une entrée doit s'exécuter immédiatement (append,
+    # autre encodage) ou relire une cible déjà en attente: l'ordre des
+    # écritures d'un même lot est ainsi préservé.
+    pending_writes: List[tuple] = []
+    pending_targets: set = set()
+
+    def _flush_pending() -> None:
+        nonlocal applied_count
+        if pending_writes:
+            applied_count += _flush_write_batch(fm, pending_writes, errors)
+            pending_writes.clear()
+            pending_targets.clear()
+    # Jointure de chemins en chaîne pure: évite une construction de Path
+    # et un realpath par entrée (workspace_path est déjà résolu)
+    ws_str = str(workspace_path)
+    isabs = os.path.isabs
+    normpath = os.path.normpath
+    joinpath = os.path.join
+    # Horodatage unique pour toutes les sauvegardes du lot (un seul
+    # now()/strftime pour toute la boucle)
+    backup_ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
 
     for item in writes:
         file_rel = item.get("file")
@@ -74,11 +141,9 @@ def task_apply_writes(params: Dict[str, Any], context: Dict[str, Any]) -> str:
 
         # Resolve target path
         try:
-            target_path = Path(file_rel)
-            if not target_path.is_absolute():
-                target_path = workspace_path.joinpath(target_path)
-            target_path = target_path.resolve()
-            entry["target"] = str(target_path)
+            target_str = normpath(file_rel if isabs(file_rel) else joinpath(ws_str, file_rel))
+            target_path = Path(target_str)
+            entry["target"] = target_str
         except Exception as e:
             entry["error"] = f"path_resolve_error: {str(e)}"
             report["entries"].append(entry)
@@ -96,13 +161,25 @@ def task_apply_writes(params: Dict[str, Any], context: Dict[str, Any]) -> str:
         create_backup = _to_bool(item.get("create_backup", False))
         encoding = item.get("encoding") or "utf-8"
 
+        # La cible a une écriture en attente: la soumettre d'abord pour
+        # que la relecture (backup, append, dry-run) voie le contenu à jour
+        if target_str in pending_targets:
+            _flush_pending()
+
         # Read existing content (best-effort)
         old_content = _read_text(fm, target_path, encoding=encoding)
 
-        # Dry-run: only check that a change would happen
+        # Dry-run: only check that a change would happen. Append avec du
+        # contenu change toujours; sinon comparaison directe sans
+        # concaténation intermédiaire.
         if dry_run:
-            would_change = (old_content is None) or (("" if append else "") + content) != (old_content or "")
-            entry["would_change"] = bool(would_change)
+            if old_content is None:
+                would_change = True
+            elif append:
+                would_change = bool(content)
+            else:
+                would_change = content != old_content
+            entry["would_change"] = would_change
             simulated_count += 1 if would_change else 0
             report["entries"].append(entry)
             continue
@@ -114,32 +191,43 @@ def task_apply_writes(params: Dict[str, Any], context: Dict[str, Any]) -> str:
                 try:
                     backup_dir = workspace_path.joinpath("backups")
                     backup_dir.mkdir(parents=True, exist_ok=True)
-                    ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-                    backup_name = f"{target_path.name}.bak_{ts}"
+                    backup_name = f"{target_path.name}.bak_{backup_ts}"
                     backup_path = backup_dir.joinpath(backup_name)
                     if hasattr(fm, "write_file"):
                         fm.write_file(str(backup_path), old_content)
                     else:
-                        backup_path.write_text(old_content, encoding=encoding)
+                        with open(backup_path, "w", encoding=encoding, buffering=1 << 17) as bf:
+                            bf.write(old_content)
                     entry["backup"] = str(backup_path)
                 except Exception as be:
                     logger.warning("Failed to create backup for %s: %s", target_path, be)
                     entry.setdefault("warnings", []).append(f"backup_failed:{str(be)}")
 
-            # Perform write/append
-            try:
-                _safe_write_text(fm, target_path, content, append=append, encoding=encoding)
-                entry["applied"] = True
-                applied_count += 1
-            except Exception as we:
-                entry["error"] = f"write_error: {str(we)}"
-                errors.append(str(we))
+            # Perform write/append. Les écritures simples sont mises en
+            # attente et soumises en lot; append et encodages spécifiques
+            # gardent le chemin unitaire.
+            if not append and encoding == "utf-8":
+                pending_writes.append((entry, target_path, content))
+                pending_targets.add(target_str)
+            else:
+                try:
+                    # Écriture immédiate: vider le lot avant, pour ne pas
+                    # réordonner cette écriture devant celles en attente
+                    _flush_pending()
+                    _safe_write_text(fm, target_path, content, append=append, encoding=encoding)
+                    entry["applied"] = True
+                    applied_count += 1
+                except Exception as we:
+                    entry["error"] = f"write_error: {str(we)}"
+                    errors.append(str(we))
         except Exception as e:
             entry["error"] = f"unexpected_error: {str(e)}"
             errors.append(str(e))
 
         report["entries"].append(entry)
 
+    _flush_pending()
+
     # determine status
     if dry_run:
         report["status"] = "dry_run_ok" if simulated_count > 0 else "dry_run_no_change"
@@ -148,11 +236,30 @@ def task_apply_writes(params: Dict[str, Any], context: Dict[str, Any]) -> str:
 
     # write report best-effort
     try:
-        if hasattr(fm, "write_file"):
-            fm.write_file(out_path, json.dumps(report, indent=2, ensure_ascii=False))
+        sink = context.get("report_sink")
+        if sink is not None:
+            # Regroupé avec les autres rapports, flushé par l'appelant
+            sink.queue(out_path, _json_dumps_bytes(report).decode("utf-8"))
+        elif _HAS_ORJSON:
+            # Sérialisation C en un bloc: le plus rapide quand dispo
+            report_bytes = _json_dumps_bytes(report)
+            if hasattr(fm, "write_file"):
+                fm.write_file(out_path, report_bytes.decode("utf-8"))
+            else:
+                report_file = Path(out_path)
+                report_file.parent.mkdir(parents=True, exist_ok=True)
+                report_file.write_bytes(report_bytes)
         else:
-            Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-            Path(out_path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            # Sans orjson, émission incrémentale via json.dump: pas de
+            # chaîne JSON monolithique en mémoire pour les gros lots
+            if hasattr(fm, "open_for_write"):
+                report_fp = fm.open_for_write(out_path)
+            else:
+                report_file = Path(out_path)
+                report_file.parent.mkdir(parents=True, exist_ok=True)
+                report_fp = open(report_file, "w", encoding="utf-8", buffering=1 << 17)
+            with report_fp:
+                json.dump(report, report_fp, indent=2, ensure_ascii=False)
     except Exception as e:
         logger.error("Failed to write apply_writes report: %s", e)
 
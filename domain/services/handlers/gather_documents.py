@@ -1,5 +1,8 @@
 # domain/services/handlers/gather_documents.py
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 import datetime
@@ -15,9 +18,43 @@ from domain.services.helpers import (
     _to_bool,
 )
 
+try:
+    # Automate multi-motifs C (un seul passage quel que soit le nombre
+    # de termes); retombe sur une alternation regex compilée sinon
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
+def _build_term_matcher(terms):
+    """
+    Construit un prédicat haystack -> bool testant tous les termes en
+    une passe (Aho-Corasick si dispo, sinon regex compilée).
+    """
+    if not terms:
+        return lambda haystack: False
+    if _ahocorasick is not None:
+        automaton = _ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return lambda haystack: next(automaton.iter(haystack), None) is not None
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms)))
+    search = pattern.search
+    return lambda haystack: search(haystack) is not None
+
+
+def _read_document(file_path) -> tuple:
+    """Lit un document en entier; retourne (contenu, None) ou (None, exc)."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as fh:
+            return fh.read(), None
+    except Exception as exc:
+        return None, exc
+
+
 def _collect_terms(source: Any, variables: Dict[str, str]) -> List[str]:
     """
     Resolve a source into a list of clean search terms.
@@ -92,6 +129,8 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         search_terms = default_terms.copy()
 
     search_terms_set = {term.lower() for term in search_terms if term}
+    sorted_patterns = sorted(search_terms_set)
+    term_matches = _build_term_matcher(search_terms_set)
 
     # Exclude directories
     exclude_sources = [
@@ -105,7 +144,9 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         for entry in _collect_terms(source, variables):
             exclude_dirs.add(entry)
 
-    gathered_docs: List[Dict[str, Any]] = []
+    # Chemins retenus (relatif, absolu): le contenu n'est jamais chargé
+    # en mémoire, il est streamé dans le rapport à l'écriture
+    gathered_paths: List[tuple] = []
     errors: List[str] = []
 
     workspace_display = str(workspace_path)
@@ -117,7 +158,7 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
                 {
                     "event": "started",
                     "workspace": workspace_display,
-                    "patterns": sorted(search_terms_set),
+                    "patterns": sorted_patterns,
                     "task": getattr(task_obj, "name", None),
                     "mission": getattr(mission, "name", None),
                     "mode": mode or "unknown",
@@ -126,87 +167,61 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         except Exception:
             logger.debug("Context bridge publish diagnostic failed at start", exc_info=True)
 
-    def should_skip(directory: Path) -> bool:
-        name = directory.name
+    # Méthode liée résolue une fois: évite un lookup d'attribut (et la
+    # gestion d'AttributeError) par répertoire visité. Si la liste de
+    # motifs sanctuaire est explicitement vide, aucun chemin ne peut
+    # matcher: on coupe tous les appels du parcours.
+    is_sanctuary = getattr(guardrail_ref, "is_sanctuary_path", None)
+    if hasattr(guardrail_ref, "sanctuary_paths") and not guardrail_ref.sanctuary_paths:
+        is_sanctuary = None
+
+    def should_skip(name: str, path_str: str) -> bool:
         if not name:
             return False
         if name in exclude_dirs:
             return True
-        if name.startswith(".") and name not in {"."}:
+        if name.startswith(".") and name != ".":
+            return True
+        if is_sanctuary is not None and is_sanctuary(path_str):
             return True
-        try:
-            if guardrail_ref.is_sanctuary_path(str(directory)):
-                return True
-        except AttributeError:
-            return False
         return False
 
-    # Walk the workspace
-    for root, dirs, files in os.walk(workspace_path):
-        current_dir = Path(root)
-
-        if current_dir != workspace_path and should_skip(current_dir):
-            dirs[:] = []
-            continue
-
-        # Filter out directories to skip for next level
-        dirs[:] = [d for d in dirs if not should_skip(current_dir / d)]
+    # Walk the workspace. Aucun Path n'est construit dans la boucle:
+    # les chemins relatifs sont dérivés par découpe de chaîne sur le
+    # préfixe du workspace plutôt que via relative_to().
+    ws_root = str(workspace_path)
+    ws_prefix_len = len(ws_root) + 1
+    sep_needs_fix = os.sep != "/"
+    joinpath = os.path.join
+    for root, dirs, files in os.walk(ws_root):
+        # Chaque racine visitée a déjà passé le filtre ci-dessous à
+        # l'itération parente: un seul verdict sanctuaire par dossier.
+        dirs[:] = [d for d in dirs if not should_skip(d, joinpath(root, d))]
 
         for filename in files:
-            file_path = current_dir / filename
+            file_path = joinpath(root, filename)
 
             try:
                 try:
-                    try:
-                        if guardrail_ref.is_sanctuary_path(str(file_path)):
-                            continue
-                    except AttributeError:
-                        pass
+                    if is_sanctuary is not None and is_sanctuary(file_path):
+                        continue
 
-                    relative_path = file_path.relative_to(workspace_path).as_posix()
-                    haystack = f"{filename.lower()} {relative_path.lower()}"
+                    relative_path = file_path[ws_prefix_len:]
+                    if sep_needs_fix:
+                        relative_path = relative_path.replace(os.sep, "/")
 
-                    if not any(term in haystack for term in search_terms_set):
+                    # Court-circuit sur le nom seul (cas courant): le
+                    # chemin relatif n'est abaissé et testé que si le
+                    # nom ne porte pas le motif — pas de haystack
+                    # concaténé par fichier.
+                    if not term_matches(filename.lower()) and not term_matches(relative_path.lower()):
                         continue
 
-                    # Read file content via file_manager (best-effort)
-                    try:
-                        content = file_manager_ref.read_file(str(file_path))
-                    except Exception:
-                        # fallback: try simple read
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as fh:
-                                content = fh.read()
-                        except Exception as exc_read:
-                            errors.append(f"{relative_path}: {exc_read}")
-                            if context_bridge_ref:
-                                try:
-                                    context_bridge_ref.publish_diagnostic(
-                                        "task_gather_documents",
-                                        {
-                                            "event": "read_failed",
-                                            "document": relative_path,
-                                            "error": str(exc_read),
-                                        },
-                                    )
-                                except Exception:
-                                    logger.debug("Failed to publish read_failed", exc_info=True)
-                            continue
-
-                    gathered_docs.append({"path": relative_path, "content": content})
-                    if context_bridge_ref:
-                        try:
-                            context_bridge_ref.publish_diagnostic(
-                                "task_gather_documents",
-                                {
-                                    "event": "document_collected",
-                                    "document": relative_path,
-                                    "patterns": sorted(search_terms_set),
-                                    "count": len(gathered_docs),
-                                },
-                            )
-                        except Exception:
-                            logger.debug("Failed to publish document_collected", exc_info=True)
+                    # La lecture est différée: seul le chemin est retenu,
+                    # le contenu sera streamé directement dans le rapport.
+                    # Pas de diagnostic unitaire ici: un événement agrégé
+                    # est publié après le parcours.
+                    gathered_paths.append((relative_path, file_path))
 
                 except Exception as exc_inner:  # pragma: no cover - instrumentation only
                     message = f"{relative_path if 'relative_path' in locals() else file_path}: {exc_inner}"
@@ -217,7 +232,7 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
                                 "task_gather_documents",
                                 {
                                     "event": "read_failed",
-                                    "document": relative_path if 'relative_path' in locals() else str(file_path),
+                                    "document": relative_path if 'relative_path' in locals() else file_path,
                                     "error": str(exc_inner),
                                 },
                             )
@@ -231,6 +246,20 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
                 logger.debug("Unexpected error while scanning %s: %s", file_path, exc, exc_info=True)
                 continue
 
+    # Diagnostic agrégé unique à la place d'un événement par document
+    if context_bridge_ref and gathered_paths:
+        try:
+            context_bridge_ref.publish_diagnostic(
+                "task_gather_documents",
+                {
+                    "event": "documents_collected_batch",
+                    "count": len(gathered_paths),
+                    "patterns": sorted_patterns,
+                },
+            )
+        except Exception:
+            logger.debug("Failed to publish documents_collected_batch", exc_info=True)
+
     duration_seconds = (datetime.datetime.now() - start_timestamp).total_seconds()
 
     # Build report content (Markdown)
@@ -244,7 +273,7 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         report_name = f"{report_name}.md"
     report_path = Path("reports") / report_name
 
-    report_lines: List[str] = [
+    header_lines = [
         "# 🌦️ Rapport de collecte météo",
         "",
         f"**Workspace :** `{workspace_display}`",
@@ -252,35 +281,11 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         f"**Généré le :** {start_timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
         "",
         f"**Motifs recherchés :** {', '.join(sorted(search_terms_set))}",
-        f"**Documents collectés :** {len(gathered_docs)}",
+        f"**Documents collectés :** {len(gathered_paths)}",
         "",
+        "## Documents",
     ]
 
-    report_lines.append("## Documents")
-
-    if gathered_docs:
-        for doc in gathered_docs:
-            report_lines.extend(
-                [
-                    f"### `{doc['path']}`",
-                    "",
-                    "```",
-                    doc["content"],
-                    "```",
-                    "",
-                ]
-            )
-    else:
-        report_lines.append("_Aucun document correspondant aux motifs fournis._")
-        report_lines.append("")
-
-    if errors:
-        report_lines.append("## Incidents")
-        report_lines.extend(f"- WARNING: {msg}" for msg in errors)
-        report_lines.append("")
-
-    report_content = "\n".join(report_lines)
-
     report_path_str = str(report_path)
     try:
         guardrail_ref.check_path(report_path_str, operation="write")
@@ -288,20 +293,56 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         # best-effort
         logger.debug("Guardrail check_path failed for %s", report_path_str, exc_info=True)
 
+    # Écriture streamée avec préchargement parallèle: les lectures
+    # (I/O, GIL relâché) recouvrent l'écriture séquentielle du rapport.
+    # La mémoire reste bornée à la fenêtre de préchargement.
+    streamed_docs: List[str] = []
     try:
-        if hasattr(file_manager_ref, "write_file"):
-            file_manager_ref.write_file(report_path_str, report_content)
-        else:
-            report_path.parent.mkdir(parents=True, exist_ok=True)
-            report_path.write_text(report_content, encoding="utf-8")
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8", buffering=1 << 17) as out:
+            write = out.write
+            for line in header_lines:
+                write(line)
+                write("\n")
+
+            if gathered_paths:
+                window = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=window) as pool:
+                    pending: deque = deque()
+                    total = len(gathered_paths)
+                    next_index = min(window, total)
+                    for _, file_path in gathered_paths[:next_index]:
+                        pending.append(pool.submit(_read_document, file_path))
+                    for relative_path, _ in gathered_paths:
+                        content, exc_read = pending.popleft().result()
+                        if next_index < total:
+                            pending.append(
+                                pool.submit(_read_document, gathered_paths[next_index][1])
+                            )
+                            next_index += 1
+                        if exc_read is not None:
+                            errors.append(f"{relative_path}: {exc_read}")
+                            continue
+                        write(f"### `{relative_path}`\n\n```\n")
+                        write(content)
+                        write("\n```\n\n")
+                        streamed_docs.append(relative_path)
+            else:
+                write("_Aucun document correspondant aux motifs fournis._\n\n")
+
+            if errors:
+                write("## Incidents\n")
+                for msg in errors:
+                    write(f"- WARNING: {msg}\n")
+                write("\n")
     except Exception as exc:
         errors.append(f"Failed to write report: {exc}")
         logger.error("Failed to write gather_documents report: %s", exc)
 
     summary = {
         "report_path": report_path_str,
-        "documents": [doc["path"] for doc in gathered_docs],
-        "patterns": sorted(search_terms_set),
+        "documents": streamed_docs,
+        "patterns": sorted_patterns,
         "duration_seconds": round(duration_seconds, 3),
         "errors": errors,
     }
@@ -316,7 +357,7 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
                 mode=mode,
                 summary=summary,
             )
-            final_event = "completed_with_warnings" if errors or not gathered_docs else "completed"
+            final_event = "completed_with_warnings" if errors or not streamed_docs else "completed"
             context_bridge_ref.publish_diagnostic(
                 "task_gather_documents",
                 {
@@ -328,8 +369,8 @@ def task_gather_documents(params: Dict[str, Any], context: Dict[str, Any]) -> st
         except Exception:
             logger.debug("Context bridge publish diagnostic failed at completion", exc_info=True)
 
-    status_prefix = "[WARN]" if errors or not gathered_docs else "[OK]"
+    status_prefix = "[WARN]" if errors or not streamed_docs else "[OK]"
     return (
         f"{status_prefix} Rapport météo collecté : {report_path_str} "
-        f"({len(gathered_docs)} document(s), {duration_seconds:.2f} s)"
+        f"({len(streamed_docs)} document(s), {duration_seconds:.2f} s)"
     )
@@ -4,6 +4,8 @@ from collections import Counter
 import json
 import datetime
 import logging
+import os
+import sys
 from typing import Any, Dict, List, Optional
 
 from core.file_manager import file_manager
@@ -62,85 +64,136 @@ def task_gather_overview(params: Dict[str, Any], context: Dict[str, Any]) -> str
 
     exclude_dirs = {"venv", "__pycache__", ".git", ".idea", ".mypy_cache", ".pytest_cache", "node_modules", ".dart_tool", "build"}
 
-    def should_skip(directory: Path) -> bool:
-        name = directory.name
+    # Méthode liée résolue une fois pour tout le parcours; une liste de
+    # motifs sanctuaire explicitement vide coupe tous les appels
+    is_sanctuary = getattr(guard, "is_sanctuary_path", None)
+    if hasattr(guard, "sanctuary_paths") and not guard.sanctuary_paths:
+        is_sanctuary = None
+
+    def should_skip(name: str, path_str: str) -> bool:
         if not name:
             return False
         if name in exclude_dirs:
             return True
-        if name.startswith(".") and name not in {"."}:
+        if name.startswith(".") and name != ".":
+            return True
+        if is_sanctuary is not None and is_sanctuary(path_str):
             return True
-        try:
-            if guard.is_sanctuary_path(str(directory)):
-                return True
-        except AttributeError:
-            return False
         return False
 
-    gathered_data = {
-        "workspace": str(workspace_path),
-        "scan_depth": scan_depth,
-        "extensions": sorted(clean_extensions),
-        "directories": [],
-        "files": [],
-        "file_stats": Counter(),
-        "scan_timestamp": start_timestamp.isoformat(),
-    }
-
-    tree_lines: List[str] = ["./"]
-    matching_files: List[str] = []
     errors: List[str] = []
     total_dirs = 1
     total_files = 0
 
-    def walk(directory: Path, depth: int, prefix: str) -> None:
-        nonlocal total_dirs, total_files
-
+    # Parcours itératif sur os.scandir: le type des entrées vient du
+    # d_type du readdir (pas de stat par entrée) et les chemins relatifs
+    # sont dérivés par découpe de chaîne plutôt que via relative_to().
+    ws_str = str(workspace_path)
+    ws_prefix_len = len(ws_str) + 1
+    sep_needs_fix = os.sep != "/"
+    splitext = os.path.splitext
+    intern = sys.intern
+
+    # Le parcours n'alimente qu'une seule liste plate d'enregistrements
+    # (is_dir, préfixe+connecteur, nom, rel, suffixe, correspond); les
+    # structures finales (arbre, listes, stats) sont dérivées ensuite en
+    # passes dédiées sur ce tableau — moins d'appends entrelacés pendant
+    # la boucle chaude, et chaque passe reste locale en cache.
+    records: List[tuple] = []
+    add_record = records.append
+
+    # Pile de travail LIFO (empilée en ordre inverse pour restituer
+    # l'ordre du parcours récursif):
+    #   ('L', chemin, profondeur, préfixe)         -> lister un dossier
+    #   ('D', record, chemin, prof, préf)          -> émettre un dossier
+    #   record (tuple simple)                      -> émettre un fichier
+    stack: List[tuple] = [("L", ws_str, 0, "")]
+    while stack:
+        item = stack.pop()
+        kind = item[0]
+
+        if kind is False:
+            # Enregistrement de fichier poussé tel quel
+            add_record(item)
+            continue
+
+        if kind == "D":
+            _, record, dir_path, depth, prefix = item
+            add_record(record)
+            if depth <= scan_depth:
+                stack.append(("L", dir_path, depth, prefix))
+            continue
+
+        _, dir_path, depth, prefix = item
+        # Partition dossiers/fichiers pendant le scandir puis tri plat
+        # des tuples pré-décorés (minuscule, rang readdir): pas de
+        # lambda ni de tuple-clé alloué par comparaison, et un seul
+        # appel is_dir par entrée. Le rang garantit la même résolution
+        # d'égalité que le tri stable précédent.
+        dir_children: List[tuple] = []
+        file_children: List[tuple] = []
         try:
-            entries = sorted(
-                directory.iterdir(),
-                key=lambda entry: (not entry.is_dir(), entry.name.lower()),
-            )
+            with os.scandir(dir_path) as it:
+                rank = 0
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if should_skip(name, entry.path):
+                            continue
+                        dir_children.append((name.lower(), rank, True, name, entry.path))
+                    else:
+                        total_files += 1
+                        file_children.append((name.lower(), rank, False, name, entry.path))
+                    rank += 1
         except OSError as exc:
-            errors.append(f"{directory}: {exc}")
-            return
+            errors.append(f"{dir_path}: {exc}")
+            continue
+
+        dir_children.sort()
+        file_children.sort()
+        ordered = dir_children + file_children
+
+        last_index = len(ordered) - 1
+        next_depth = depth + 1
+        for index in range(last_index, -1, -1):
+            _, _, is_dir, name, entry_path = ordered[index]
+            connector = "└──" if index == last_index else "├──"
+            rel_path = entry_path[ws_prefix_len:]
+            if sep_needs_fix:
+                rel_path = rel_path.replace(os.sep, "/")
+            if is_dir:
+                total_dirs += 1
+                next_prefix = prefix + ("    " if index == last_index else "│   ")
+                stack.append((
+                    "D",
+                    (True, prefix + connector, name, rel_path, "", True),
+                    entry_path,
+                    next_depth,
+                    next_prefix,
+                ))
+            else:
+                suffix = intern(splitext(name)[1].lower())
+                matched = suffix in clean_extensions or not clean_extensions
+                stack.append((False, prefix + connector, name, rel_path, suffix, matched))
 
-        directories: List[Path] = []
-        files: List[Path] = []
+    # Passes finales vectorisées sur le tableau d'enregistrements
+    tree_lines: List[str] = ["./"]
+    tree_lines.extend(
+        pc + (" 📁 " + name + "/" if is_dir else " 📄 " + name)
+        for is_dir, pc, name, _, _, matched in records
+        if matched
+    )
+    matching_files = [rel for is_dir, _, _, rel, _, matched in records if matched and not is_dir]
 
-        for entry in entries:
-            if entry.is_dir():
-                if should_skip(entry):
-                    continue
-                directories.append(entry)
-            else:
-                total_files += 1
-                files.append(entry)
-
-        total_dirs += len(directories)
-
-        ordered_entries = directories + files
-        for index, entry in enumerate(ordered_entries):
-            is_last = index == len(ordered_entries) - 1
-            connector = "└──" if is_last else "├──"
-
-            if entry.is_dir():
-                rel_path = entry.relative_to(workspace_path).as_posix()
-                tree_lines.append(f"{prefix}{connector} 📁 {entry.name}/")
-                gathered_data["directories"].append(rel_path)
-                if depth + 1 <= scan_depth:
-                    next_prefix = prefix + ("    " if is_last else "│   ")
-                    walk(entry, depth + 1, next_prefix)
-            else:
-                suffix = entry.suffix.lower()
-                rel_path = entry.relative_to(workspace_path).as_posix()
-                gathered_data["file_stats"][suffix or "[none]"] += 1
-                if suffix in clean_extensions or not clean_extensions:
-                    matching_files.append(rel_path)
-                    tree_lines.append(f"{prefix}{connector} 📄 {entry.name}")
-                gathered_data["files"].append(rel_path)
-
-    walk(workspace_path, 0, "")
+    gathered_data = {
+        "workspace": ws_str,
+        "scan_depth": scan_depth,
+        "extensions": sorted(clean_extensions),
+        "directories": [rel for is_dir, _, _, rel, _, _ in records if is_dir],
+        "files": [rel for is_dir, _, _, rel, _, _ in records if not is_dir],
+        "file_stats": Counter(suf or "[none]" for is_dir, _, _, _, suf, _ in records if not is_dir),
+        "scan_timestamp": start_timestamp.isoformat(),
+    }
 
     gathered_data["tree_lines"] = tree_lines
     gathered_data["matching_files"] = sorted(matching_files)
@@ -1,5 +1,8 @@
 # domain/services/handlers/report_generation.py
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
+import io
 import json
 import datetime
 import logging
@@ -79,102 +82,121 @@ def task_generate_report(params: Dict[str, Any], context: Dict[str, Any]) -> str
     if not report_path.is_absolute() and report_path.parent == Path("."):
         report_path = Path("reports") / report_path.name
 
-    # Générer le contenu Markdown
-    report_lines: List[str] = [
-        "# Rapport de Lecture AIHomeCoder",
-        "",
-        f"**Mission :** {getattr(mission, 'name', 'Unknown')}",
-        f"**Workspace :** `{gathered_data.get('workspace', '?')}`",
-        f"**Généré le :** {start_timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
-        "",
-        "## Vue d'ensemble",
-        "",
-        f"- **Répertoires trouvés :** {gathered_data.get('total_directories', 0)}",
-        f"- **Fichiers trouvés :** {gathered_data.get('total_files', 0)}",
-        f"- **Fichiers correspondant aux critères :** {gathered_data.get('matching_files_count', 0)}",
-        "",
-    ]
+    # Écrire le rapport en flux: les lignes partent directement dans le
+    # handle tamponné (open_for_write vérifie le guardrail), sans liste
+    # intermédiaire ni join monolithique. Pour un file_manager injecté
+    # sans API de flux, on retombe sur un StringIO remis à write_file.
+    report_path_str = str(report_path)
+    try:
+        guard.check_path(report_path_str, operation="write")
+    except Exception:
+        logger.debug("Guardrail check_path failed for %s", report_path_str, exc_info=True)
+
+    buf: Optional[io.StringIO] = None
+    out = None
+    try:
+        if hasattr(fm, "open_for_write"):
+            out = fm.open_for_write(report_path_str)
+        elif not hasattr(fm, "write_file"):
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            out = open(report_path, "w", encoding="utf-8", buffering=1 << 17)
+        else:
+            buf = io.StringIO()
+            out = buf
+    except Exception as exc:
+        logger.error("Failed to open report for writing: %s", exc)
+        buf = io.StringIO()
+        out = buf
+
+    w = out.write
+    w(
+        "# Rapport de Lecture AIHomeCoder\n"
+        "\n"
+        f"**Mission :** {getattr(mission, 'name', 'Unknown')}\n"
+        f"**Workspace :** `{gathered_data.get('workspace', '?')}`\n"
+        f"**Généré le :** {start_timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        "\n"
+        "## Vue d'ensemble\n"
+        "\n"
+        f"- **Répertoires trouvés :** {gathered_data.get('total_directories', 0)}\n"
+        f"- **Fichiers trouvés :** {gathered_data.get('total_files', 0)}\n"
+        f"- **Fichiers correspondant aux critères :** {gathered_data.get('matching_files_count', 0)}\n"
+        "\n"
+    )
 
     if gathered_data.get("extensions"):
-        report_lines.extend([
-            "## Extensions ciblées",
-            "",
-        ])
+        w("## Extensions ciblées\n\n")
+        # Une seule passe sur la liste de fichiers: comptage des
+        # suffixes puis lookup O(1) par extension, au lieu d'un
+        # endswith sur toute la liste pour chaque extension
+        ext_counts: Dict[str, int] = {}
+        for f in gathered_data.get("files", []):
+            dot = f.rfind(".")
+            if dot >= 0:
+                suffix = f[dot:]
+                ext_counts[suffix] = ext_counts.get(suffix, 0) + 1
         for ext in gathered_data["extensions"]:
-            count = sum(1 for f in gathered_data.get("files", []) if f.endswith(ext))
-            report_lines.append(f"- **{ext}** : {count} fichier(s)")
-        report_lines.append("")
+            w(f"- **{ext}** : {ext_counts.get(ext, 0)} fichier(s)\n")
+        w("\n")
 
     # Statistiques par extension
     if gathered_data.get("file_stats"):
-        report_lines.extend([
-            "## Statistiques par extension",
-            "",
-        ])
-        # Sort by count descending
+        w("## Statistiques par extension\n\n")
+        # Sort by count descending (most_common est en C côté Counter)
+        file_stats = gathered_data["file_stats"]
         try:
-            items = sorted(gathered_data["file_stats"].items(), key=lambda x: -x[1])
+            if hasattr(file_stats, "most_common"):
+                items = file_stats.most_common()
+            else:
+                items = sorted(file_stats.items(), key=itemgetter(1), reverse=True)
         except Exception:
-            items = list(gathered_data["file_stats"].items())
+            items = list(file_stats.items())
         for ext, count in items:
-            report_lines.append(f"- **{ext}** : {count} fichier(s)")
-        report_lines.append("")
+            w(f"- **{ext}** : {count} fichier(s)\n")
+        w("\n")
 
     # Arborescence
     if gathered_data.get("tree_lines"):
         max_tree_lines = 200  # Limiter pour éviter des rapports trop longs
-        tree_display = gathered_data["tree_lines"][:max_tree_lines]
-        if len(gathered_data["tree_lines"]) > max_tree_lines:
-            tree_display.append(f"... ({len(gathered_data['tree_lines']) - max_tree_lines} lignes supplémentaires)")
-        report_lines.extend([
-            "## Arborescence du projet",
-            "",
-            "```",
-            *tree_display,
-            "```",
-            "",
-        ])
+        tree_lines = gathered_data["tree_lines"]
+        w("## Arborescence du projet\n\n```\n")
+        # islice: pas de copie des max_tree_lines premières lignes
+        for line in islice(tree_lines, max_tree_lines):
+            w(line)
+            w("\n")
+        if len(tree_lines) > max_tree_lines:
+            w(f"... ({len(tree_lines) - max_tree_lines} lignes supplémentaires)\n")
+        w("```\n\n")
 
     # Fichiers correspondant aux critères
     if gathered_data.get("matching_files"):
-        report_lines.extend([
-            "## Fichiers correspondant aux critères",
-            "",
-        ])
-        for file_path in gathered_data["matching_files"][:100]:  # Limiter à 100 fichiers
-            report_lines.append(f"- `{file_path}`")
-        if len(gathered_data["matching_files"]) > 100:
-            report_lines.append(f"... et {len(gathered_data['matching_files']) - 100} fichier(s) supplémentaire(s)")
-        report_lines.append("")
+        w("## Fichiers correspondant aux critères\n\n")
+        matching = gathered_data["matching_files"]
+        for file_path in islice(matching, 100):  # Limiter à 100 fichiers
+            w(f"- `{file_path}`\n")
+        if len(matching) > 100:
+            w(f"... et {len(matching) - 100} fichier(s) supplémentaire(s)\n")
+        w("\n")
 
     # Erreurs
     if gathered_data.get("errors"):
-        report_lines.extend([
-            "## Incidents",
-            "",
-        ])
+        w("## Incidents\n\n")
         for error in gathered_data["errors"]:
-            report_lines.append(f"- ⚠️ WARNING: {error}")
-        report_lines.append("")
-
-    report_lines.append("---")
-    report_lines.append(f"*Rapport généré par AIHomeCoder v1.0.0*")
+            w(f"- ⚠️ WARNING: {error}\n")
+        w("\n")
 
-    report_content = "\n".join(report_lines)
+    w("---\n*Rapport généré par AIHomeCoder v1.0.0*")
 
-    # Écrire le rapport
-    report_path_str = str(report_path)
     try:
-        guard.check_path(report_path_str, operation="write")
-    except Exception:
-        logger.debug("Guardrail check_path failed for %s", report_path_str, exc_info=True)
-
-    try:
-        if hasattr(fm, "write_file"):
-            fm.write_file(report_path_str, report_content)
+        if buf is not None:
+            report_content = buf.getvalue()
+            if hasattr(fm, "write_file"):
+                fm.write_file(report_path_str, report_content)
+            else:
+                report_path.parent.mkdir(parents=True, exist_ok=True)
+                report_path.write_text(report_content, encoding="utf-8")
         else:
-            report_path.parent.mkdir(parents=True, exist_ok=True)
-            report_path.write_text(report_content, encoding="utf-8")
+            out.close()
     except Exception as exc:
         logger.error("Failed to write report: %s", exc)
         # best-effort: still return status with failure info
@@ -3,6 +3,9 @@ from pathlib import Path
 import json
 import datetime
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 from core.file_manager import file_manager
@@ -11,42 +14,127 @@ from domain.services.helpers import _pick_string
 logger = logging.getLogger(__name__)
 
 
-def should_skip(path: Path, ignore_names: List[str], ignore_patterns: List[str]) -> bool:
-    name = path.name
-    # skip by exact name
-    if name in ignore_names:
-        return True
-    # simple suffix/prefix pattern matches
+def _compile_ignores(ignore_names: List[str], ignore_patterns: List[str]) -> tuple:
+    """
+    Compile les règles d'exclusion en structures C-level testées en un
+    appel chacune: set de noms exacts, tuples pour endswith/startswith
+    et alternation regex pour les sous-chaînes.
+    """
+    names_set = set(ignore_names)
+    suffixes: List[str] = []
+    prefixes: List[str] = []
+    substrings: List[str] = []
     for pat in ignore_patterns:
-        if pat.startswith("*") and name.endswith(pat.lstrip("*")):
-            return True
-        if pat.endswith("*") and name.startswith(pat.rstrip("*")):
-            return True
-        if pat in name:
-            return True
-    return False
+        if pat.startswith("*"):
+            suffixes.append(pat.lstrip("*"))
+        elif pat.endswith("*"):
+            prefixes.append(pat.rstrip("*"))
+        else:
+            substrings.append(pat)
+    substr_re = re.compile("|".join(re.escape(pat) for pat in substrings)) if substrings else None
+    return names_set, tuple(suffixes), tuple(prefixes), substr_re
+
+
+def should_skip(name: str, ignore_names: List[str], ignore_patterns: List[str]) -> bool:
+    names_set, suffix_tuple, prefix_tuple, substr_re = _compile_ignores(ignore_names, ignore_patterns)
+    return (
+        name in names_set
+        or (bool(suffix_tuple) and name.endswith(suffix_tuple))
+        or (bool(prefix_tuple) and name.startswith(prefix_tuple))
+        or (substr_re is not None and substr_re.search(name) is not None)
+    )
+
+
+def _walk_subtree(
+    start_path: str,
+    start_depth: int,
+    max_depth: Optional[int],
+    compiled: tuple,
+    prefix_len: int,
+    sep_needs_fix: bool,
+) -> List[str]:
+    """DFS scandir d'un sous-arbre; retourne les chemins relatifs collectés."""
+    names_set, suffix_tuple, prefix_tuple, substr_re = compiled
+    results: List[str] = []
+    # (chemin, profondeur des entrées listées)
+    stack: List[tuple] = [(start_path, start_depth)]
+    while stack:
+        dir_path, depth = stack.pop()
+        if max_depth is not None and depth > max_depth:
+            continue
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    if (
+                        name in names_set
+                        or (suffix_tuple and name.endswith(suffix_tuple))
+                        or (prefix_tuple and name.startswith(prefix_tuple))
+                        or (substr_re is not None and substr_re.search(name) is not None)
+                    ):
+                        continue
+                    rel = entry.path[prefix_len:]
+                    if sep_needs_fix:
+                        rel = rel.replace(os.sep, "/")
+                    results.append(rel)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    return results
 
 
 def _gather_paths(root: Path, max_depth: int, ignore_names: List[str], ignore_patterns: List[str]) -> List[str]:
-    results = []
-    root = root.resolve()
-    base_depth = len(root.parts)
-    for p in root.rglob("*"):
-        try:
-            rel = p.relative_to(root)
-        except Exception:
-            continue
-        depth = len(rel.parts)
-        if max_depth is not None and depth > max_depth:
-            continue
-        if should_skip(p, ignore_names, ignore_patterns):
-            if p.is_dir():
-                # skip walking into it by continuing
-                continue
-            else:
-                continue
-        # include both files and directories (string path)
-        results.append(str(rel.as_posix()))
+    # Le niveau racine est listé une fois en série; chaque sous-arbre de
+    # premier niveau est ensuite parcouru par _walk_subtree, en
+    # parallèle (readdir/stat bloquants, GIL relâché) dès qu'il y a
+    # assez de dossiers pour amortir le pool. Les dossiers ignorés sont
+    # élagués avant la descente et les chemins relatifs dérivés par
+    # découpe de chaîne sur le préfixe racine.
+    root_str = str(root.resolve())
+    prefix_len = len(root_str) + 1
+    sep_needs_fix = os.sep != "/"
+    # Règles d'exclusion compilées une fois pour tout le parcours
+    compiled = _compile_ignores(ignore_names, ignore_patterns)
+    names_set, suffix_tuple, prefix_tuple, substr_re = compiled
+
+    results: List[str] = []
+    top_dirs: List[str] = []
+    if max_depth is not None and max_depth < 1:
+        return results
+    try:
+        with os.scandir(root_str) as it:
+            for entry in it:
+                name = entry.name
+                if (
+                    name in names_set
+                    or (suffix_tuple and name.endswith(suffix_tuple))
+                    or (prefix_tuple and name.startswith(prefix_tuple))
+                    or (substr_re is not None and substr_re.search(name) is not None)
+                ):
+                    continue
+                rel = entry.path[prefix_len:]
+                if sep_needs_fix:
+                    rel = rel.replace(os.sep, "/")
+                results.append(rel)
+                if entry.is_dir(follow_symlinks=False):
+                    top_dirs.append(entry.path)
+    except OSError:
+        return results
+
+    if top_dirs and (max_depth is None or max_depth >= 2):
+        def walk(path: str) -> List[str]:
+            return _walk_subtree(path, 2, max_depth, compiled, prefix_len, sep_needs_fix)
+
+        if len(top_dirs) >= 4:
+            workers = min(8, os.cpu_count() or 1, len(top_dirs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for sub in pool.map(walk, top_dirs):
+                    results.extend(sub)
+        else:
+            # Trop peu de sous-arbres pour amortir le pool
+            for path in top_dirs:
+                results.extend(walk(path))
     return sorted(results)
 
 
@@ -96,13 +184,22 @@ def task_tree_scan(params: Dict[str, Any], context: Dict[str, Any]) -> str:
         "status": None,
     }
 
+    def _emit_report() -> None:
+        # Un report_sink injecté regroupe les rapports en un flush
+        payload = json.dumps(report, indent=2, ensure_ascii=False)
+        sink = context.get("report_sink")
+        if sink is not None:
+            sink.queue(out_path, payload)
+        else:
+            fm.write_file(out_path, payload)
+
     try:
         # Best-effort: ensure workspace exists
         if not workspace_path.exists():
             report["status"] = "workspace_not_found"
             report["error"] = f"Workspace not found: {workspace_path}"
             try:
-                fm.write_file(out_path, json.dumps(report, indent=2, ensure_ascii=False))
+                _emit_report()
             except Exception as e:
                 logger.error("Failed to write tree_scan report: %s", e)
             return "[ERROR] workspace not found"
@@ -114,7 +211,7 @@ def task_tree_scan(params: Dict[str, Any], context: Dict[str, Any]) -> str:
 
         # write report (best-effort)
         try:
-            fm.write_file(out_path, json.dumps(report, indent=2, ensure_ascii=False))
+            _emit_report()
         except Exception as e:
             logger.error("Failed to write tree_scan report: %s", e)
 
@@ -126,7 +223,7 @@ def task_tree_scan(params: Dict[str, Any], context: Dict[str, Any]) -> str:
         report["status"] = "error"
         report["error"] = str(e)
         try:
-            fm.write_file(out_path, json.dumps(report, indent=2, ensure_ascii=False))
+            _emit_report()
         except Exception as e2:
             logger.error("Failed to write tree_scan error report: %s", e2)
         return f"[ERROR] {str(e)}"
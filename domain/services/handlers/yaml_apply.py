@@ -1,9 +1,12 @@
 # domain/services/handlers/yaml_apply.py
+from functools import lru_cache
 from pathlib import Path
 import json
 import datetime
 from typing import Any, Dict
 import logging
+import mmap
+import os
 import re
 
 from core.file_manager import file_manager
@@ -12,6 +15,51 @@ from core.guardrail import guardrail
 logger = logging.getLogger(__name__)
 
 
+# Seuil "gros fichier": pré-filtrage mmap en lecture, écriture
+# atomique temp + os.replace en écriture
+_LARGE_FILE_THRESHOLD = 1 << 20
+
+
+def _anchor_absent_in_large_file(path_str: str, anchor: str) -> bool:
+    """
+    True si le fichier dépasse le seuil et ne contient pas l'ancre.
+
+    Le scan se fait sur le tampon mmap (bytes, recherche C) sans jamais
+    décoder le contenu: les gros fichiers non concernés par un
+    remplacement ne coûtent ni lecture str ni allocation.
+    """
+    try:
+        if os.path.getsize(path_str) < _LARGE_FILE_THRESHOLD:
+            return False
+        with open(path_str, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(anchor.encode("utf-8")) == -1
+    except (OSError, ValueError, UnicodeEncodeError):
+        return False
+
+
+def _atomic_write(path_str: str, content: str) -> None:
+    """
+    Écrit via fichier temporaire puis os.replace.
+
+    Le fichier cible est substitué d'un seul rename atomique: une
+    interruption en cours d'écriture ne peut pas le laisser tronqué.
+    """
+    tmp_path = path_str + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path_str)
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int) -> "re.Pattern":
+    """Compile (et mémorise) un anchor_pattern; un même motif répété
+    sur plusieurs fichiers n'est compilé qu'une fois."""
+    return re.compile(pattern, flags)
+
+
 def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) -> str:
     """
     Minimal YAML-driven replacer used by TaskLogicHandler.
@@ -45,6 +93,11 @@ def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) ->
     report = {"status": None, "entries": []}
     errors = []
 
+    # Hoistés hors de la boucle: workspace déjà résolu et horodatage
+    # partagé par toutes les sauvegardes du lot
+    backup_dir = workspace_path.joinpath("backups")
+    backup_ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
     for item in replacements:
         file_rel = item.get("file")
         anchor = item.get("anchor") or ""
@@ -57,14 +110,7 @@ def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) ->
             report["entries"].append(entry)
             continue
 
-        target_path = Path(workspace_path).joinpath(file_rel)
-        try:
-            content = fm.read_file(str(target_path))
-        except Exception as e:
-            entry["error"] = f"read_error: {str(e)}"
-            report["entries"].append(entry)
-            errors.append(str(e))
-            continue
+        target_path = workspace_path.joinpath(file_rel)
 
         # parameters
         anchor_pattern = item.get("anchor_pattern") or anchor
@@ -81,11 +127,30 @@ def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) ->
         if item.get("dotall", False):
             flags |= re.DOTALL
 
+        # Pré-filtrage mmap: une ancre littérale absente d'un gros
+        # fichier court-circuite la lecture str (la variante
+        # ignore_indent exige aussi la présence de l'ancre littérale)
+        if (
+            anchor
+            and not use_regex
+            and not case_insensitive
+            and _anchor_absent_in_large_file(str(target_path), anchor)
+        ):
+            content = ""
+        else:
+            try:
+                content = fm.read_file(str(target_path))
+            except Exception as e:
+                entry["error"] = f"read_error: {str(e)}"
+                report["entries"].append(entry)
+                errors.append(str(e))
+                continue
+
         matches = []
         # Find matches according to mode
         try:
             if use_regex and anchor_pattern:
-                pattern = re.compile(anchor_pattern, flags)
+                pattern = _compile(anchor_pattern, flags)
                 for m in pattern.finditer(content):
                     matches.append((m.start(), m.end(), m.group(0)))
             elif anchor:
@@ -122,10 +187,8 @@ def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) ->
             try:
                 # create backup if requested
                 if create_backup:
-                    backup_dir = Path(workspace_path).joinpath("backups")
                     backup_dir.mkdir(parents=True, exist_ok=True)
-                    ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-                    backup_name = f"{Path(file_rel).name}.bak_{ts}"
+                    backup_name = f"{Path(file_rel).name}.bak_{backup_ts}"
                     backup_path = backup_dir.joinpath(backup_name)
                     fm.write_file(str(backup_path), content)
                     entry["backup"] = str(backup_path)
@@ -169,27 +232,21 @@ def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) ->
                         else:
                             new_content, n = pattern.subn(repl, new_content, count=1)
                 else:
-                    # simple substring replacement
-                    if include_anchor:
-                        if replace_all:
-                            new_content = new_content.replace(anchor, anchor + after)
-                            n = entry["occurrences"]
-                        else:
-                            if occurrence:
-                                new_content = new_content.replace(anchor, anchor + after, 1)  # simplest: replace first occurrence only
-                                n = 1
-                            else:
-                                new_content = new_content.replace(anchor, anchor + after, 1)
-                                n = 1
-                    else:
-                        if replace_all:
-                            new_content = new_content.replace(anchor, after)
-                            n = entry["occurrences"]
-                        else:
-                            new_content = new_content.replace(anchor, after, 1)
-                            n = 1
+                    # simple substring replacement: un seul passage
+                    # split/join au lieu d'un scan replace supplémentaire
+                    parts = new_content.split(anchor) if replace_all else new_content.split(anchor, 1)
+                    n = len(parts) - 1
+                    glue = anchor + after if include_anchor else after
+                    new_content = glue.join(parts)
 
-                fm.write_file(str(target_path), new_content)
+                target_str = str(target_path)
+                if len(new_content) >= _LARGE_FILE_THRESHOLD:
+                    # Gros contenu: écriture atomique (le guardrail est
+                    # vérifié ici puisqu'on n'emprunte pas write_file)
+                    guard.check_path(target_str, operation="write")
+                    _atomic_write(target_str, new_content)
+                else:
+                    fm.write_file(target_str, new_content)
                 entry["applied"] = True
                 entry["applied_matches"] = n
             except Exception as e:
@@ -217,9 +274,15 @@ def apply_yaml_replacements(params: Dict[str, Any], context: Dict[str, Any]) ->
     else:
         report["status"] = "applied" if any(e.get("applied") for e in report["entries"]) else "no_change"
 
-    # write report (best-effort)
+    # write report (best-effort); un report_sink injecté regroupe les
+    # écritures de rapports de plusieurs handlers en un seul flush
     try:
-        fm.write_file(out_path, json.dumps(report, indent=2, ensure_ascii=False))
+        report_json = json.dumps(report, indent=2, ensure_ascii=False)
+        sink = context.get("report_sink")
+        if sink is not None:
+            sink.queue(out_path, report_json)
+        else:
+            fm.write_file(out_path, report_json)
     except Exception as e:
         logger.error("Failed to write yaml_apply report: %s", e)
 
@@ -2,6 +2,7 @@
 from pathlib import Path
 import json
 import logging
+import re
 from typing import Any, Dict, List, Optional
 
 from core.file_manager import file_manager
@@ -10,6 +11,62 @@ from core.context_bridge import context_bridge
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        """Sérialise en JSON indenté (UTF-8) via orjson (extension C)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # Fallback stdlib, plus lent mais toujours présent
+    _HAS_ORJSON = False
+
+    def _json_dumps_bytes(obj: Any) -> bytes:
+        """Sérialise en JSON indenté (UTF-8) via la stdlib."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+# Tampon d'E/S élargi (128 KiB) pour les rapports et sauvegardes,
+# nettement plus efficace que les 8 KiB par défaut sur gros contenus
+_IO_BUFFER_SIZE = 1 << 17
+
+
+class ReportSink:
+    """
+    File d'attente d'écritures de rapports.
+
+    Les handlers qui s'enchaînent dans une même mission y déposent
+    (chemin, contenu) via queue(); flush() soumet tout le lot en une
+    seule fois par FileManager.write_files (guardrail et mkdir amortis)
+    au lieu d'un open/write/close synchrone par rapport. Injecté en
+    option dans le contexte sous la clé 'report_sink'.
+    """
+
+    def __init__(self, fm=None):
+        self._fm = fm or file_manager
+        self._pending: List[tuple] = []
+
+    def queue(self, path: str, content: str) -> None:
+        """Met en attente l'écriture d'un rapport."""
+        self._pending.append((path, content))
+
+    def flush(self) -> int:
+        """Écrit tous les rapports en attente; retourne leur nombre."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        if hasattr(self._fm, "write_files"):
+            self._fm.write_files(batch)
+        else:
+            for path, content in batch:
+                self._fm.write_file(path, content)
+        return len(batch)
+
+
+# Motif générique ${VAR}: une seule regex module pour tous les appels,
+# les clés inconnues sont laissées telles quelles à la substitution
+_PH_RE = re.compile(r"\$\{([^}]+)\}")
+
 
 def _resolve_placeholders(value: Any, variables: Dict[str, str]) -> Any:
     """
@@ -28,14 +85,18 @@ def _resolve_placeholders(value: Any, variables: Dict[str, str]) -> Any:
         except Exception:
             # en cas d'erreur (chaîne non décodable), retomber proprement sur l'original
             decoded = value
-        return decoded
-        for key, raw_val in (variables or {}).items():
+        if variables and "${" in decoded:
+            # Substitution en une seule passe C au lieu d'un replace par
+            # variable; un placeholder sans variable correspondante est
+            # conservé tel quel
             try:
-                result = result.replace(f"${{{key}}}", str(raw_val))
+                decoded = _PH_RE.sub(
+                    lambda m: str(variables.get(m.group(1), m.group(0))), decoded
+                )
             except Exception:
                 # best-effort: ignore problematic replacements
-                continue
-        return result
+                pass
+        return decoded
 
     if isinstance(value, list):
         return [_resolve_placeholders(item, variables) for item in value]
@@ -189,19 +250,23 @@ def _safe_write_text(
                     old = None
             else:
                 if path_obj.exists():
-                    old = path_obj.read_text(encoding=encoding)
+                    # Lecture brute en un seul read() puis décodage
+                    with open(path_obj, "rb", buffering=0) as f:
+                        old = f.read().decode(encoding)
         except Exception:
             old = None
         new_content = (old or "") + content
         if hasattr(fm, "write_file"):
             fm.write_file(str(path_obj), new_content)
         else:
-            path_obj.write_text(new_content, encoding=encoding)
+            with open(path_obj, "w", encoding=encoding, buffering=_IO_BUFFER_SIZE) as f:
+                f.write(new_content)
     else:
         if hasattr(fm, "write_file"):
             fm.write_file(str(path_obj), content)
         else:
-            path_obj.write_text(content, encoding=encoding)
+            with open(path_obj, "w", encoding=encoding, buffering=_IO_BUFFER_SIZE) as f:
+                f.write(content)
 
 
 def _collect_variables(params: Optional[Dict[str, Any]], context_section: Optional[Dict[str, Any]]) -> Dict[str, str]:
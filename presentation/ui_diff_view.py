@@ -10,7 +10,7 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
-from domain.entities import DiffResult
+from domain.entities import DiffResult, DiffType
 
 
 def safe_print(text: str) -> str:
@@ -54,15 +54,16 @@ class UIDiffView:
         table.add_column("Contenu", style="white")
         
         for diff_line in diff_result.diff_lines[:50]:  # Limite l'affichage
-            line_type = diff_line.diff_type.value
-            if diff_line.diff_type.value == "added":
+            diff_type = diff_line.diff_type
+            line_type = str(diff_type)
+            if diff_type is DiffType.ADDED:
                 style = "green"
-            elif diff_line.diff_type.value == "removed":
+            elif diff_type is DiffType.REMOVED:
                 style = "red"
             else:
                 style = "yellow"
-            
-            content = diff_line.new_content if diff_line.diff_type.value != "removed" else diff_line.old_content
+
+            content = diff_line.new_content if diff_type is not DiffType.REMOVED else diff_line.old_content
             
             table.add_row(
                 str(diff_line.line_number),